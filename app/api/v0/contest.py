@@ -1,6 +1,7 @@
 from typing import List
 
-from services import contest_service
+from core.config import settings
+from services import contest_service, scoreboard, scoreboard_snapshots
 from database.schemas.contest import (
     ContestCreate,
     ContestUpdate,
@@ -8,7 +9,7 @@ from database.schemas.contest import (
     ContestWithProblems
 )
 from database.schemas.contest_result import ContestResultInDB
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from starlette import status
 
 contest_router = APIRouter()
@@ -43,7 +44,9 @@ async def create_contest(
         name=contest.name,
         description=contest.description,
         event_id=contest.event_id,
-        date_id=contest.date_id
+        date_id=contest.date_id,
+        judging_policy=contest.judging_policy,
+        submissions_per_minute=contest.submissions_per_minute
     )
 
     if not result["success"]:
@@ -111,7 +114,21 @@ async def delete_contest(
 
 
 @contest_router.get("/{contest_id}/results", response_model=List[ContestResultInDB])
-async def get_contest_results(contest_id: str):
+async def get_contest_results(contest_id: str, request: Request):
+    snapshot = await scoreboard_snapshots.get(contest_id)
+
+    if snapshot is not None:
+        headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if snapshot.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(snapshot.compressed, media_type="application/json", headers=headers)
+
+        return Response(snapshot.body, media_type="application/json", headers=headers)
+
     contest = contest_service.get_contest(contest_id)
 
     if not contest:
@@ -125,6 +142,76 @@ async def get_contest_results(contest_id: str):
     return results
 
 
+@contest_router.get("/{contest_id}/scoreboard")
+async def get_scoreboard(
+        contest_id: str,
+        offset: int = Query(0, ge=0, description="Skip ranks"),
+        limit: int = Query(settings.scoreboard.page_size, ge=1, le=500, description="Limit ranks")
+):
+    return {
+        "total": await scoreboard.size(contest_id),
+        "offset": offset,
+        "results": await scoreboard.page(contest_id, offset, limit)
+    }
+
+
+@contest_router.get("/{contest_id}/scoreboard/users/{user_id}")
+async def get_scoreboard_user_rank(contest_id: str, user_id: int):
+    entry = await scoreboard.rank(contest_id, user_id)
+
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User {user_id} is not ranked in contest {contest_id}"
+        )
+
+    return entry
+
+
+@contest_router.get("/{contest_id}/scoreboard/users/{user_id}/around")
+async def get_scoreboard_around_user(
+        contest_id: str,
+        user_id: int,
+        radius: int = Query(settings.scoreboard.around_radius, ge=0, le=100, description="Ranks above and below")
+):
+    entries = await scoreboard.around(contest_id, user_id, radius)
+
+    if not entries:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User {user_id} is not ranked in contest {contest_id}"
+        )
+
+    return entries
+
+
+@contest_router.post("/{contest_id}/scoreboard/rebuild")
+async def rebuild_scoreboard(contest_id: str):
+    contest = contest_service.get_contest(contest_id)
+
+    if not contest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Contest with ID {contest_id} not found"
+        )
+
+    return {"contest_id": contest_id, "ranked": await scoreboard.rebuild(contest_id)}
+
+
+@contest_router.post("/{contest_id}/scoreboard/freeze")
+async def freeze_scoreboard(contest_id: str):
+    await scoreboard.freeze(contest_id)
+
+    return {"contest_id": contest_id, "frozen": True}
+
+
+@contest_router.post("/{contest_id}/scoreboard/unfreeze")
+async def unfreeze_scoreboard(contest_id: str):
+    version = await scoreboard.unfreeze(contest_id)
+
+    return {"contest_id": contest_id, "frozen": False, "version": version}
+
+
 @contest_router.post("/{contest_id}/languages/{language_id}", status_code=status.HTTP_200_OK)
 async def add_language_to_contest(
         contest_id: str,
@@ -204,3 +204,18 @@ async def get_sample_test_cases(
 ):
     samples = problem_service.get_sample_test_cases(problem_id)
     return samples
+
+
+@problem_router.get("/{problem_id}/testset")
+async def get_testset(
+        problem_id: str
+):
+    testset = problem_service.get_testset(problem_id)
+
+    if not testset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Problem with ID {problem_id} not found"
+        )
+
+    return testset
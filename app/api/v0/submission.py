@@ -1,65 +1,68 @@
-from typing import List
+import math
+from json import dumps
+from typing import Any, Dict, List, Optional
 
 from core.auth import get_current_user
-from services import submission_service
+from services import judge_scheduler, submission_service, verdict_events
+from services.verdict_events import IN_PROGRESS_STATUSES
 from repositories import submission_repo
 from database.schemas.submission import (
+    SubmissionAccepted,
     SubmissionCreate,
     SubmissionInDB,
+    SubmissionSummary,
     SubmissionWithResults
 )
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from starlette import status
 
 submission_router = APIRouter()
 
+EVENT_KEEPALIVE_SECONDS = 15
 
-@submission_router.post("/", response_model=SubmissionInDB, status_code=status.HTTP_201_CREATED)
+
+@submission_router.post("/", response_model=SubmissionAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def create_submission(
         submission: SubmissionCreate,
-        background_tasks: BackgroundTasks,
+        request: Request,
+        response: Response,
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
         current_user=Depends(get_current_user)
 ):
     user_id = current_user["id"]
 
-    result = submission_service.create_submission(
+    result = await submission_service.create_submission(
         user_id=user_id,
         problem_id=str(submission.problem_id),
         contest_id=str(submission.contest_id),
         language=submission.language,
-        code=submission.code
+        code=submission.code,
+        idempotency_key=idempotency_key
     )
 
     if not result["success"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=result["message"]
-        )
+        _raise_rejection(result, status.HTTP_400_BAD_REQUEST)
 
-    background_tasks.add_task(
-        submission_service.judge_submission,
-        submission_id=result["submission_id"]
-    )
-
-    created_submission = submission_service.get_submission(result["submission_id"])
-    if not created_submission:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve created submission"
-        )
+    submission_id = result["submission_id"]
+    status_url = str(request.url_for("get_submission", submission_id=submission_id))
+    response.headers["Location"] = status_url
+    if result.get("replayed"):
+        response.headers["Idempotent-Replayed"] = "true"
 
     return {
-        "id": created_submission["id"],
-        "user_id": created_submission["user_id"],
-        "problem_id": created_submission["problem_id"],
-        "contest_id": created_submission["contest_id"],
-        "language": created_submission["language"],
-        "code": created_submission["code"],
-        "submitted_at": created_submission["submitted_at"],
-        "status": created_submission.get("status", "Pending")
+        "submission_id": submission_id,
+        "status": result["status"],
+        "status_url": status_url,
+        "events_url": str(request.url_for("stream_submission_events", submission_id=submission_id))
     }
 
 
+@submission_router.get("/queue/stats")
+async def get_queue_stats():
+    return await judge_scheduler.stats()
+
+
 @submission_router.get("/{submission_id}", response_model=SubmissionWithResults)
 async def get_submission(
         submission_id: str,
@@ -91,84 +94,96 @@ async def get_submission(
     }
 
 
-@submission_router.get("/", response_model=List[SubmissionInDB])
+@submission_router.get("/{submission_id}/events")
+async def stream_submission_events(
+        submission_id: str,
+        current_user=Depends(get_current_user)
+):
+    sub = submission_repo.find_by_id(submission_id, only=("user_id", "status"))
+    if not sub:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Submission with ID {submission_id} not found"
+        )
+
+    if sub.user_id != current_user["id"] and not current_user.get("is_admin", False):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view this submission"
+        )
+
+    async def stream():
+        # Subscribe before reading the current status so no transition falls in between.
+        async with verdict_events.subscribe(submission_id) as pubsub:
+            current = submission_repo.find_by_id(submission_id, only=("status",))
+            final = current.status not in IN_PROGRESS_STATUSES
+
+            yield _sse_message({"event": "status", "status": current.status, "final": final})
+            if final:
+                return
+
+            while True:
+                event = await verdict_events.next_event(pubsub, EVENT_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                yield _sse_message(event)
+                if event.get("final"):
+                    return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@submission_router.get("/", response_model=List[SubmissionSummary])
 async def get_user_submissions(
+        response: Response,
         skip: int = Query(0, description="Skip items"),
         limit: int = Query(20, description="Limit items"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
         current_user=Depends(get_current_user)
 ):
     user_id = current_user["id"]
 
-    submissions = submission_service.get_user_submissions(user_id, skip, limit)
-    return submissions
+    page = submission_service.get_user_submissions(user_id, skip, limit, cursor)
+    return _page_response(page, response)
 
 
-@submission_router.get("/contest/{contest_id}", response_model=List[SubmissionInDB])
+@submission_router.get("/contest/{contest_id}", response_model=List[SubmissionSummary])
 async def get_contest_submissions(
         contest_id: str,
+        response: Response,
         skip: int = Query(0, description="Skip items"),
-        limit: int = Query(20, description="Limit items")
+        limit: int = Query(20, description="Limit items"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor")
 ):
-    submissions_list = submission_repo.find_by_contest(contest_id, skip, limit)
-
-    result = []
-    for sub in submissions_list:
-        result.append({
-            "id": str(sub.id),
-            "user_id": sub.user_id,
-            "problem_id": str(sub.problem_id.id),
-            "contest_id": str(sub.contest_id.id),
-            "language": sub.language,
-            "code": sub.code,
-            "submitted_at": sub.submitted_at,
-            "status": getattr(sub, "status", "Unknown")
-        })
+    page = submission_service.get_contest_submissions(contest_id, skip, limit, cursor)
+    return _page_response(page, response)
 
-    return result
 
-
-@submission_router.get("/problem/{problem_id}", response_model=List[SubmissionInDB])
+@submission_router.get("/problem/{problem_id}", response_model=List[SubmissionSummary])
 async def get_problem_submissions(
         problem_id: str,
+        response: Response,
         skip: int = Query(0, description="Skip items"),
-        limit: int = Query(20, description="Limit items")
+        limit: int = Query(20, description="Limit items"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor")
 ):
-    submissions_list = submission_repo.find_by_problem(problem_id, skip, limit)
-
-    result = []
-    for sub in submissions_list:
-        result.append({
-            "id": str(sub.id),
-            "user_id": sub.user_id,
-            "problem_id": str(sub.problem_id.id),
-            "contest_id": str(sub.contest_id.id),
-            "language": sub.language,
-            "code": sub.code,
-            "submitted_at": sub.submitted_at,
-            "status": getattr(sub, "status", "Unknown")
-        })
-
-    return result
+    page = submission_service.get_problem_submissions(problem_id, skip, limit, cursor)
+    return _page_response(page, response)
 
 
 @submission_router.post("/{submission_id}/rejudge", response_model=SubmissionInDB)
 async def rejudge_submission(
-        submission_id: str,
-        background_tasks: BackgroundTasks
+        submission_id: str
 ):
-    sub = submission_service.get_submission(submission_id)
-    if not sub:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Submission with ID {submission_id} not found"
-        )
-
-    background_tasks.add_task(
-        submission_service.judge_submission,
-        submission_id=submission_id
-    )
-
-    submission_repo.update(submission_id, {"status": "Rejudging"})
+    result = await submission_service.rejudge_submission(submission_id)
+    if not result["success"]:
+        _raise_rejection(result, status.HTTP_404_NOT_FOUND)
 
     updated_sub = submission_service.get_submission(submission_id)
 
@@ -182,3 +197,41 @@ async def rejudge_submission(
         "submitted_at": updated_sub["submitted_at"],
         "status": "Rejudging"
     }
+
+
+def _page_response(page: Dict[str, Any], response: Response) -> List[Dict[str, Any]]:
+    if not page["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=page["message"]
+        )
+
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+
+    return page["items"]
+
+
+def _raise_rejection(result: Dict[str, Any], default_status: int) -> None:
+    reason = result.get("reason")
+
+    if reason == "rate_limited":
+        status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    elif reason == "overloaded":
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    elif reason == "in_progress":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=result["message"])
+    elif reason == "idempotency_mismatch":
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=result["message"])
+    else:
+        raise HTTPException(status_code=default_status, detail=result["message"])
+
+    raise HTTPException(
+        status_code=status_code,
+        detail=result["message"],
+        headers={"Retry-After": str(math.ceil(result["retry_after"]))}
+    )
+
+
+def _sse_message(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {dumps(event)}\n\n"
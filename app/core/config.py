@@ -40,6 +40,77 @@ class CachingConfig(BaseModel):
     url: RedisDsn = "redis://localhost:6379/0"
 
 
+class JudgeConfig(BaseModel):
+    sandbox_pool_enabled: bool = True
+    sandbox_pool_size: int = 4
+    sandbox_prestart: int = 1
+    sandbox_idle_timeout: int = 300
+    sandbox_health_check_interval: int = 30
+    sandbox_memory_limit: int = 512
+    sandbox_work_dir: str | None = None
+    execution_mode: Literal["sequential", "batch", "parallel"] = "batch"
+    parallel_workers: int = 4
+    cpu_set: list[int] = []
+    wall_time_multiplier: float = 3.0
+    compile_cache_enabled: bool = True
+    compile_cache_dir: str | None = None
+    compile_cache_max_bytes: int = 512 * 1024 * 1024
+    verdict_cache_enabled: bool = True
+    testset_cache_enabled: bool = True
+    testset_cache_dir: str | None = None
+    testset_cache_max_bytes: int = 1024 * 1024 * 1024
+    result_storage: Literal["collection", "embedded"] = "collection"
+    result_write_behind: bool = False
+    result_flush_interval: float = 0.05
+    result_flush_max_batch: int = 1000
+
+
+class JudgeQueueConfig(BaseModel):
+    url: RedisDsn | None = None
+    fake: bool = False
+    stream: str = "judge:jobs"
+    group: str = "judge-workers"
+    dead_letter_stream: str = "judge:dead"
+    visibility_timeout: int = 300
+    heartbeat_interval: int = 60
+    max_retries: int = 3
+    block_ms: int = 1000
+    worker_concurrency: int = 2
+
+
+class JudgeSchedulerConfig(BaseModel):
+    prefix: str = "judge:sched"
+    track_quota: int = 0
+    event_quota: int = 0
+    dispatch_window: int = 4
+    lock_ttl_ms: int = 5000
+
+
+class ScoreboardConfig(BaseModel):
+    prefix: str = "scoreboard"
+    page_size: int = 50
+    around_radius: int = 5
+    recompute_interval: float = 1.0
+    snapshot_max_age: float = 1.0
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    prefix: str = "ratelimit"
+    user_submissions_per_minute: int = 10
+    contest_submissions_per_minute: int = 0
+    rejudges_per_minute: int = 60
+    backpressure_depth: int = 1000
+    backpressure_shed: list[str] = ["rejudge", "archive"]
+    backpressure_retry_after: int = 30
+
+
+class IdempotencyConfig(BaseModel):
+    prefix: str = "idempotency"
+    ttl: int = 86400
+    lock_ttl: int = 30
+
+
 class SecurityConfig(BaseModel):
     key: str = "your-secret-key"
     algorithm: str = "HS256"
@@ -57,6 +128,12 @@ class Settings(BaseSettings):
     logging: LoggingConfig = LoggingConfig()
     db: DatabaseConfig = DatabaseConfig()
     caching: CachingConfig = CachingConfig()
+    judge: JudgeConfig = JudgeConfig()
+    judge_queue: JudgeQueueConfig = JudgeQueueConfig()
+    judge_scheduler: JudgeSchedulerConfig = JudgeSchedulerConfig()
+    scoreboard: ScoreboardConfig = ScoreboardConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    idempotency: IdempotencyConfig = IdempotencyConfig()
     security: SecurityConfig = SecurityConfig()
 
 
@@ -1,9 +1,17 @@
+from .idempotency import IdempotencyStore
+from .job_queue import Job, JobQueue
+from .rate_limit import LocalTokenBucket, RateLimiter
 from .repository import AbstractRepository, SQLAlchemyRepository
 from .unit_of_work import AbstractUnitOfWork, CachedSQLAlchemyUnitOfWork
 
 __all__ = [
     "AbstractRepository",
     "AbstractUnitOfWork",
+    "IdempotencyStore",
+    "Job",
+    "JobQueue",
+    "LocalTokenBucket",
+    "RateLimiter",
     "SQLAlchemyRepository",
     "CachedSQLAlchemyUnitOfWork",
 ]
\ No newline at end of file
@@ -0,0 +1,19 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from bson import ObjectId
+
+
+def encode_cursor(submitted_at: datetime, document_id: ObjectId) -> str:
+    raw = f"{submitted_at.isoformat()}|{document_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        submitted_at, document_id = raw.split("|", 1)
+        return datetime.fromisoformat(submitted_at), ObjectId(document_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
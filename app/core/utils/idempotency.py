@@ -0,0 +1,57 @@
+import hashlib
+from json import dumps, loads
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+IDEMPOTENCY_NEW = "new"
+IDEMPOTENCY_REPLAY = "replay"
+IDEMPOTENCY_IN_PROGRESS = "in_progress"
+IDEMPOTENCY_MISMATCH = "mismatch"
+
+
+class IdempotencyStore:
+    def __init__(self, redis: Redis, prefix: str = "idempotency", ttl: int = 86400, lock_ttl: int = 30):
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+
+    @staticmethod
+    def fingerprint(payload: Dict[str, Any]) -> str:
+        return hashlib.sha256(dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def begin(self, scope: str, key: str, fingerprint: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        redis_key = self._key(scope, key)
+        claim = dumps({"state": "pending", "fingerprint": fingerprint})
+
+        # The short lock TTL frees the key if the claiming request dies before completing.
+        if await self.redis.set(redis_key, claim, nx=True, ex=self.lock_ttl):
+            return IDEMPOTENCY_NEW, None
+
+        raw = await self.redis.get(redis_key)
+        if raw is None:
+            return await self.begin(scope, key, fingerprint)
+
+        record = loads(raw)
+
+        if record["fingerprint"] != fingerprint:
+            return IDEMPOTENCY_MISMATCH, None
+
+        if record["state"] != "done":
+            return IDEMPOTENCY_IN_PROGRESS, None
+
+        return IDEMPOTENCY_REPLAY, record["response"]
+
+    async def complete(self, scope: str, key: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        await self.redis.set(
+            self._key(scope, key),
+            dumps({"state": "done", "fingerprint": fingerprint, "response": response}),
+            ex=self.ttl
+        )
+
+    async def release(self, scope: str, key: str) -> None:
+        await self.redis.delete(self._key(scope, key))
+
+    def _key(self, scope: str, key: str) -> str:
+        return f"{self.prefix}:{scope}:{key}"
@@ -0,0 +1,99 @@
+from typing import Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+
+class Job:
+    def __init__(self, message_id: str, fields: Dict[str, str], deliveries: int = 1):
+        self.message_id = message_id
+        self.fields = fields
+        self.deliveries = deliveries
+
+    def __repr__(self):
+        return f"<Job(message_id={self.message_id}, fields={self.fields}, deliveries={self.deliveries})>"
+
+
+class JobQueue:
+    def __init__(self, redis: Redis, stream: str, group: str, dead_letter_stream: str,
+                 visibility_timeout: int = 300, max_retries: int = 3):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.dead_letter_stream = dead_letter_stream
+        self.visibility_timeout = visibility_timeout
+        self.max_retries = max_retries
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def enqueue(self, fields: Dict[str, str]) -> str:
+        message_id = await self.redis.xadd(self.stream, fields)
+        return self._decode(message_id)
+
+    async def reserve(self, consumer: str, block_ms: int = 5000) -> Optional[Job]:
+        job = await self._reclaim(consumer)
+        if job is not None:
+            return job
+
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=1, block=block_ms
+        )
+
+        for _, messages in response or []:
+            for message_id, fields in messages:
+                return Job(self._decode(message_id), self._decode_fields(fields))
+
+        return None
+
+    async def extend(self, job: Job, consumer: str) -> None:
+        await self.redis.xclaim(
+            self.stream, self.group, consumer, 0, [job.message_id], justid=True
+        )
+
+    async def ack(self, job: Job) -> None:
+        await self.redis.xack(self.stream, self.group, job.message_id)
+        await self.redis.xdel(self.stream, job.message_id)
+
+    async def fail(self, job: Job, error: str) -> bool:
+        if job.deliveries < self.max_retries:
+            return False
+
+        await self.redis.xadd(self.dead_letter_stream, {**job.fields, "error": error[:1000]})
+        await self.ack(job)
+        return True
+
+    async def depth(self) -> int:
+        return await self.redis.xlen(self.stream)
+
+    async def _reclaim(self, consumer: str) -> Optional[Job]:
+        response = await self.redis.xautoclaim(
+            self.stream, self.group, consumer, self.visibility_timeout * 1000, start_id="0-0", count=1
+        )
+        messages = response[1] if response else []
+
+        for message_id, fields in messages:
+            if fields is None:
+                continue
+
+            message_id = self._decode(message_id)
+            pending = await self.redis.xpending_range(
+                self.stream, self.group, min=message_id, max=message_id, count=1
+            )
+            deliveries = pending[0]["times_delivered"] if pending else 1
+
+            return Job(message_id, self._decode_fields(fields), deliveries)
+
+        return None
+
+    @staticmethod
+    def _decode(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    @classmethod
+    def _decode_fields(cls, fields) -> Dict[str, str]:
+        return {cls._decode(key): cls._decode(value) for key, value in fields.items()}
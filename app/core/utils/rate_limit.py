@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+
+return {allowed, tostring(retry_after)}
+"""
+
+
+class LocalTokenBucket:
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, capacity: int, rate: float, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return True, 0.0
+
+            self._buckets[key] = (tokens, now)
+            return False, (cost - tokens) / rate
+
+
+class RateLimiter:
+    def __init__(self, redis: Redis, prefix: str = "ratelimit"):
+        self.redis = redis
+        self.prefix = prefix
+        self.fallback = LocalTokenBucket()
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, capacity: int, rate: float, cost: int = 1) -> Tuple[bool, float]:
+        if capacity <= 0 or rate <= 0:
+            return True, 0.0
+
+        try:
+            allowed, retry_after = await self._script(
+                keys=[f"{self.prefix}:{key}"], args=[capacity, rate, cost]
+            )
+        except (RedisError, OSError):
+            logger.warning("Redis rate limiter unavailable, falling back to in-process buckets")
+            return self.fallback.acquire(key, capacity, rate, cost)
+
+        return bool(int(allowed)), float(retry_after)
@@ -0,0 +1,70 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    def __init__(self, repository, flush_interval: float = 0.05, max_batch: int = 1000):
+        self.repository = repository
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: List[Tuple[List[Dict[str, Any]], Future]] = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def add(self, items: List[Dict[str, Any]]) -> Future:
+        future = Future()
+
+        if not items:
+            future.set_result(0)
+            return future
+
+        with self._lock:
+            self._pending.append((items, future))
+            self._size += len(items)
+            if self._size >= self.max_batch:
+                self._wakeup.set()
+
+        return future
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending, self._size = self._pending, [], 0
+
+        if not pending:
+            return 0
+
+        try:
+            written = self.repository.create_many(
+                [item for items, _ in pending for item in items]
+            )
+        except Exception as e:
+            logger.exception("Failed to flush %d buffered writes", len(pending))
+            for _, future in pending:
+                future.set_exception(e)
+            return 0
+
+        for items, future in pending:
+            future.set_result(len(items))
+
+        return written
+
+    def close(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
@@ -8,9 +8,11 @@ from .contest import Contest
 from .contest_language import ContestLanguage
 from .problem import Problem
 from .test_case import TestCase
-from .submission import Submission
+from .submission import Submission, TestResultEntry
 from .submission_result import SubmissionResult
 from .contest_result import ContestResult
+from .problem_standing import ProblemStanding
+from .verdict_cache import VerdictCacheEntry
 
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/contest_db')
 
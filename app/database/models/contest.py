@@ -10,6 +10,8 @@ class Contest(Document):
     date_id = IntField()
     track_id = IntField()
     is_active = BooleanField(default=True)
+    judging_policy = StringField(choices=('full', 'first_failure'), default='full')
+    submissions_per_minute = IntField()
 
     meta = {
         'collection': 'contests',
@@ -13,6 +13,8 @@ class Problem(Document):
     output_type_id = ReferenceField('OutputType')
     time_limit = FloatField(default=1.0)
     memory_limit = IntField(default=256)
+    testset_version = IntField(default=0)
+    testset_hash = StringField()
 
     meta = {
         'collection': 'problems',
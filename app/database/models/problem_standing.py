@@ -0,0 +1,25 @@
+from mongoengine import Document, IntField, BooleanField, ReferenceField, DateTimeField, ObjectIdField
+
+
+class ProblemStanding(Document):
+    DoesNotExist = None
+    id = ObjectIdField(primary_key=True)
+    contest_id = ReferenceField('Contest', required=True)
+    user_id = IntField(required=True)
+    problem_id = ReferenceField('Problem', required=True)
+    attempts = IntField(default=0)
+    solved = BooleanField(default=False)
+    first_ac_at = DateTimeField()
+    penalty = IntField(default=0)
+
+    meta = {
+        'collection': 'problem_standings',
+        'indexes': [
+            {'fields': ['contest_id', 'user_id', 'problem_id'], 'unique': True},
+            'contest_id'
+        ]
+    }
+
+    def __repr__(self):
+        return (f"<ProblemStanding(contest_id={self.contest_id}, user_id={self.user_id}, "
+                f"problem_id={self.problem_id}, solved={self.solved})>")
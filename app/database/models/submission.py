@@ -1,7 +1,21 @@
-from mongoengine import Document, StringField, IntField, ReferenceField, DateTimeField, ObjectIdField
+from mongoengine import (
+    Document, EmbeddedDocument, StringField, IntField, FloatField, BooleanField, ReferenceField,
+    DateTimeField, ObjectIdField, EmbeddedDocumentListField
+)
 import datetime
 
 
+class TestResultEntry(EmbeddedDocument):
+    test_case_id = ObjectIdField(required=True)
+    status = StringField(required=True, max_length=50)
+    execution_time = FloatField()
+    memory_used = IntField()
+    error = StringField()
+
+    def __repr__(self):
+        return f"<TestResultEntry(test_case_id={self.test_case_id}, status='{self.status}')>"
+
+
 class Submission(Document):
     DoesNotExist = None
     id = ObjectIdField(primary_key=True)
@@ -12,11 +26,65 @@ class Submission(Document):
     code = StringField(required=True)
     submitted_at = DateTimeField(default=datetime.datetime.now(datetime.UTC))
     submission_result_id = ReferenceField('SubmissionResult')
+    status = StringField(max_length=50, default='Pending')
+    score = IntField(default=0)
+    max_time = FloatField(default=0.0)
+    max_memory = IntField(default=0)
+    standings_recorded = BooleanField(default=False)
+    test_results = EmbeddedDocumentListField(TestResultEntry)
 
     meta = {
         'collection': 'submissions',
-        'indexes': ['user_id', 'problem_id', 'contest_id', 'submitted_at']
+        'indexes': [
+            'user_id',
+            'problem_id',
+            'contest_id',
+            'submitted_at',
+            ('user_id', '-submitted_at', '-id'),
+            ('problem_id', '-submitted_at', '-id'),
+            ('contest_id', '-submitted_at', '-id')
+        ]
     }
 
     def __repr__(self):
         return f"<Submission(id={self.id}, user_id={self.user_id})>"
+
+
+class SubmissionSummary:
+    FIELDS = (
+        'id', 'user_id', 'problem_id', 'contest_id', 'language',
+        'submitted_at', 'status', 'score', 'max_time', 'max_memory'
+    )
+
+    __slots__ = FIELDS
+
+    def __init__(self, id, user_id, problem_id, contest_id, language, submitted_at,
+                 status='Pending', score=0, max_time=0.0, max_memory=0):
+        self.id = id
+        self.user_id = user_id
+        self.problem_id = problem_id
+        self.contest_id = contest_id
+        self.language = language
+        self.submitted_at = submitted_at
+        self.status = status
+        self.score = score
+        self.max_time = max_time
+        self.max_memory = max_memory
+
+    @classmethod
+    def from_mongo(cls, raw: dict) -> "SubmissionSummary":
+        return cls(
+            id=raw['_id'],
+            user_id=raw['user_id'],
+            problem_id=raw['problem_id'],
+            contest_id=raw['contest_id'],
+            language=raw['language'],
+            submitted_at=raw['submitted_at'],
+            status=raw.get('status', 'Unknown'),
+            score=raw.get('score', 0),
+            max_time=raw.get('max_time', 0.0),
+            max_memory=raw.get('max_memory', 0)
+        )
+
+    def __repr__(self):
+        return f"<SubmissionSummary(id={self.id}, user_id={self.user_id}, status='{self.status}')>"
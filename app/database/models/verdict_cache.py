@@ -0,0 +1,19 @@
+from mongoengine import Document, StringField, ListField, DictField, ReferenceField, DateTimeField, ObjectIdField
+import datetime
+
+
+class VerdictCacheEntry(Document):
+    DoesNotExist = None
+    id = ObjectIdField(primary_key=True)
+    key = StringField(required=True, unique=True)
+    problem_id = ReferenceField('Problem', required=True)
+    results = ListField(DictField())
+    created_at = DateTimeField(default=lambda: datetime.datetime.now(datetime.UTC))
+
+    meta = {
+        'collection': 'verdict_cache',
+        'indexes': ['key', 'problem_id']
+    }
+
+    def __repr__(self):
+        return f"<VerdictCacheEntry(id={self.id}, key='{self.key}')>"
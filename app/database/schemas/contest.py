@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import Field
 
 from .base import MongoBaseModel, PyObjectId
@@ -9,6 +9,8 @@ class ContestBase(MongoBaseModel):
     description: Optional[str] = None
     event_id: Optional[int] = None
     date_id: Optional[int] = None
+    judging_policy: Literal["full", "first_failure"] = "full"
+    submissions_per_minute: Optional[int] = Field(None, ge=0)
 
 
 class ContestCreate(ContestBase):
@@ -22,6 +24,8 @@ class ContestUpdate(MongoBaseModel):
     date_id: Optional[int] = None
     track_id: Optional[int] = None
     is_active: Optional[bool] = None
+    judging_policy: Optional[Literal["full", "first_failure"]] = None
+    submissions_per_minute: Optional[int] = Field(None, ge=0)
 
 
 class ContestInDB(ContestBase):
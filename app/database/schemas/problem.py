@@ -29,6 +29,8 @@ class ProblemUpdate(MongoBaseModel):
 
 class ProblemInDB(ProblemBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    testset_version: int = 0
+    testset_hash: Optional[str] = None
 
     class Config:
         allow_population_by_field_name = True
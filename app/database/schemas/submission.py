@@ -22,6 +22,13 @@ class SubmissionUpdate(MongoBaseModel):
     submission_result_id: Optional[PyObjectId] = None
 
 
+class SubmissionAccepted(MongoBaseModel):
+    submission_id: str
+    status: str
+    status_url: str
+    events_url: str
+
+
 class SubmissionInDB(SubmissionBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     submitted_at: datetime
@@ -31,6 +38,19 @@ class SubmissionInDB(SubmissionBase):
         allow_population_by_field_name = True
 
 
+class SubmissionSummary(MongoBaseModel):
+    id: PyObjectId
+    user_id: int
+    problem_id: PyObjectId
+    contest_id: PyObjectId
+    language: str
+    submitted_at: datetime
+    status: str
+    score: int = 0
+    max_time: float = 0.0
+    max_memory: int = 0
+
+
 class SubmissionResultBase(MongoBaseModel):
     submission_id: PyObjectId
     test_case_id: PyObjectId
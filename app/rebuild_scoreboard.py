@@ -0,0 +1,25 @@
+import asyncio
+import sys
+
+from core.config import settings
+from database.session import sessionmanager
+from repositories import contest_repo
+from services import scoreboard
+
+
+async def rebuild(contest_ids):
+    sessionmanager.init(
+        str(settings.db.url),
+        settings.db.db_name
+    )
+
+    try:
+        for contest_id in contest_ids or [str(contest.id) for contest in contest_repo.find()]:
+            ranked = await scoreboard.rebuild(contest_id)
+            print(f"{contest_id}: {ranked} ranked")
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild(sys.argv[1:]))
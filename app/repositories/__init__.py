@@ -8,6 +8,8 @@ from .problem import ProblemRepository
 from .test_case import TestCaseRepository
 from .submission import SubmissionRepository
 from .submission_result import SubmissionResultRepository
+from .problem_standing import ProblemStandingRepository
+from .verdict_cache import VerdictCacheRepository
 
 contest_repo = ContestRepository()
 contest_language_repo = ContestLanguageRepository()
@@ -19,3 +21,5 @@ problem_repo = ProblemRepository()
 test_case_repo = TestCaseRepository()
 submission_repo = SubmissionRepository()
 submission_result_repo = SubmissionResultRepository()
+problem_standing_repo = ProblemStandingRepository()
+verdict_cache_repo = VerdictCacheRepository()
@@ -1,6 +1,7 @@
-from typing import List, Optional, Type, TypeVar, Dict, Any, Generic
+from typing import List, Optional, Sequence, Type, TypeVar, Dict, Any, Generic
 from bson import ObjectId
 from mongoengine import Document, QuerySet
+from pymongo import UpdateOne
 
 ModelType = TypeVar("ModelType", bound=Document)
 
@@ -9,15 +10,17 @@ class BaseRepository(Generic[ModelType]):
     def __init__(self, model_class: Type[ModelType]):
         self.model_class = model_class
 
-    def find_by_id(self, id: str) -> Optional[ModelType]:
+    def find_by_id(self, id: str, only: Optional[Sequence[str]] = None,
+                   exclude: Optional[Sequence[str]] = None) -> Optional[ModelType]:
         try:
-            return self.model_class.objects.get(id=ObjectId(id))
+            return self.project(self.model_class.objects, only, exclude).get(id=ObjectId(id))
 
         except (self.model_class.DoesNotExist, ValueError):
             return None
 
-    def find_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return self.model_class.objects.skip(skip).limit(limit)
+    def find_all(self, skip: int = 0, limit: int = 100, only: Optional[Sequence[str]] = None,
+                 exclude: Optional[Sequence[str]] = None) -> List[ModelType]:
+        return self.project(self.model_class.objects, only, exclude).skip(skip).limit(limit)
 
     def count(self, **kwargs) -> int:
         return self.model_class.objects(**kwargs).count()
@@ -28,6 +31,30 @@ class BaseRepository(Generic[ModelType]):
 
         return document
 
+    def create_many(self, items: List[Dict[str, Any]]) -> int:
+        if not items:
+            return 0
+
+        documents = [self.model_class(**data) for data in items]
+        self.model_class.objects.insert(documents, load_bulk=False)
+
+        return len(documents)
+
+    def upsert_many(self, items: List[Dict[str, Any]], key_fields: List[str]) -> int:
+        if not items:
+            return 0
+
+        operations = []
+        for data in items:
+            document = self.model_class(**data).to_mongo().to_dict()
+            document.pop('_id', None)
+
+            key = {field: document[field] for field in key_fields}
+            operations.append(UpdateOne(key, {'$set': document}, upsert=True))
+
+        result = self.model_class._get_collection().bulk_write(operations, ordered=False)
+        return result.upserted_count + result.modified_count
+
     def update(self, id: str, data: Dict[str, Any]) -> Optional[ModelType]:
         document = self.find_by_id(id)
 
@@ -49,5 +76,17 @@ class BaseRepository(Generic[ModelType]):
 
         return False
 
-    def find(self, **kwargs) -> QuerySet:
-        return self.model_class.objects(**kwargs)
+    def find(self, only: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None,
+             **kwargs) -> QuerySet:
+        return self.project(self.model_class.objects(**kwargs), only, exclude)
+
+    @staticmethod
+    def project(queryset: QuerySet, only: Optional[Sequence[str]] = None,
+                exclude: Optional[Sequence[str]] = None) -> QuerySet:
+        if only:
+            queryset = queryset.only(*only)
+
+        if exclude:
+            queryset = queryset.exclude(*exclude)
+
+        return queryset
@@ -13,6 +13,10 @@ class ContestResultRepository(BaseRepository[ContestResult]):
     def find_by_contest(contest_id: str) -> List[ContestResult]:
         return ContestResult.objects(contest_id=ObjectId(contest_id)).order_by('-total_score', 'penalty')
 
+    @staticmethod
+    def find_by_users(contest_id: str, user_ids: List[int]) -> List[ContestResult]:
+        return ContestResult.objects(contest_id=ObjectId(contest_id), user_id__in=user_ids)
+
     @staticmethod
     def find_by_user_and_contest(user_id: int, contest_id: str) -> Optional[ContestResult]:
         try:
@@ -20,6 +24,17 @@ class ContestResultRepository(BaseRepository[ContestResult]):
         except ContestResult.DoesNotExist:
             return None
 
+    @staticmethod
+    def increment(contest_id: str, user_id: int, total_score: int = 0, solved_score: int = 0,
+                  penalty: int = 0) -> ContestResult:
+        return ContestResult.objects(contest_id=ObjectId(contest_id), user_id=user_id).modify(
+            upsert=True,
+            new=True,
+            inc__total_score=total_score,
+            inc__solved_score=solved_score,
+            inc__penalty=penalty
+        )
+
     @staticmethod
     def update_or_create(contest_id: str, user_id: int, data: dict) -> ContestResult:
         try:
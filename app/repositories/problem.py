@@ -1,3 +1,4 @@
+import hashlib
 from typing import List, Optional
 from bson import ObjectId
 from mongoengine import QuerySet
@@ -33,6 +34,43 @@ class ProblemRepository(BaseRepository[Problem]):
         problem.test_cases = list(TestCase.objects(problem_id=ObjectId(problem_id)))
         return problem
 
+    def bump_testset(self, problem_id: str) -> Optional[Problem]:
+        while True:
+            problem = self.find_by_id(problem_id)
+            if not problem:
+                return None
+
+            testset_hash = self.compute_testset_hash(problem_id)
+
+            updated = Problem.objects(
+                id=problem.id, testset_version=problem.testset_version
+            ).update_one(inc__testset_version=1, set__testset_hash=testset_hash)
+
+            if updated:
+                problem.testset_version += 1
+                problem.testset_hash = testset_hash
+                return problem
+
+    @classmethod
+    def compute_testset_hash(cls, problem_id: str) -> str:
+        return cls.hash_test_cases(
+            TestCase.objects(problem_id=ObjectId(problem_id)).order_by('id').only(
+                'input_data', 'expected_output', 'weight'
+            )
+        )
+
+    @staticmethod
+    def hash_test_cases(test_cases: List[TestCase]) -> str:
+        digest = hashlib.sha256()
+
+        for test_case in test_cases:
+            for value in (test_case.input_data or '', test_case.expected_output or '', str(test_case.weight)):
+                data = value.encode()
+                digest.update(len(data).to_bytes(8, 'big'))
+                digest.update(data)
+
+        return digest.hexdigest()
+
     def create(self, data: dict) -> Problem:
         problem = Problem(**data)
         problem.save()
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import List, Optional
+from bson import ObjectId
+from mongoengine import NotUniqueError
+
+from repositories.base import BaseRepository
+from database.models.problem_standing import ProblemStanding
+
+
+class ProblemStandingRepository(BaseRepository[ProblemStanding]):
+    def __init__(self):
+        super().__init__(ProblemStanding)
+
+    @staticmethod
+    def find_by_contest(contest_id: str) -> List[ProblemStanding]:
+        return ProblemStanding.objects(contest_id=ObjectId(contest_id))
+
+    @staticmethod
+    def find_by_user(contest_id: str, user_id: int) -> List[ProblemStanding]:
+        return ProblemStanding.objects(contest_id=ObjectId(contest_id), user_id=user_id)
+
+    @staticmethod
+    def record_rejection(contest_id: str, user_id: int, problem_id: str) -> bool:
+        try:
+            return bool(ProblemStanding.objects(
+                contest_id=ObjectId(contest_id),
+                user_id=user_id,
+                problem_id=ObjectId(problem_id),
+                solved=False
+            ).update_one(inc__attempts=1, upsert=True))
+        except NotUniqueError:
+            # The problem is already solved; later rejections do not count.
+            return False
+
+    @staticmethod
+    def record_acceptance(contest_id: str, user_id: int, problem_id: str, accepted_at: datetime,
+                          penalty_per_attempt: int) -> Optional[ProblemStanding]:
+        try:
+            standing = ProblemStanding.objects(
+                contest_id=ObjectId(contest_id),
+                user_id=user_id,
+                problem_id=ObjectId(problem_id),
+                solved__ne=True
+            ).modify(upsert=True, new=True, set__solved=True, set__first_ac_at=accepted_at)
+        except NotUniqueError:
+            return None
+
+        if standing is None:
+            return None
+
+        standing.penalty = (standing.attempts or 0) * penalty_per_attempt
+        ProblemStanding.objects(id=standing.id).update_one(set__penalty=standing.penalty)
+
+        return standing
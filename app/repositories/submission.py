@@ -1,11 +1,14 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from bson import ObjectId
 from datetime import datetime
+from mongoengine import Q, QuerySet
 
 from .base import BaseRepository
-from database.models.submission import Submission
+from database.models.submission import Submission, SubmissionSummary, TestResultEntry
 from database.models.submission_result import SubmissionResult
 
+ERROR_PREVIEW_LENGTH = 1024
+
 
 class SubmissionRepository(BaseRepository[Submission]):
     def __init__(self):
@@ -17,16 +20,36 @@ class SubmissionRepository(BaseRepository[Submission]):
         return submissions.first() if submissions else None
 
     @staticmethod
-    def find_by_user(user_id: int, skip: int = 0, limit: int = 100) -> List[Submission]:
-        return Submission.objects(user_id=user_id).order_by('-submitted_at').skip(skip).limit(limit)
+    def find_by_user(user_id: int, skip: int = 0, limit: int = 100,
+                     after: Optional[Tuple[datetime, ObjectId]] = None) -> List[Submission]:
+        return SubmissionRepository._page(Submission.objects(user_id=user_id), skip, limit, after)
+
+    @staticmethod
+    def find_by_problem(problem_id: str, skip: int = 0, limit: int = 100,
+                        after: Optional[Tuple[datetime, ObjectId]] = None) -> List[Submission]:
+        return SubmissionRepository._page(Submission.objects(problem_id=ObjectId(problem_id)), skip, limit, after)
 
     @staticmethod
-    def find_by_problem(problem_id: str, skip: int = 0, limit: int = 100) -> List[Submission]:
-        return Submission.objects(problem_id=ObjectId(problem_id)).order_by('-submitted_at').skip(skip).limit(limit)
+    def find_by_contest(contest_id: str, skip: int = 0, limit: int = 100,
+                        after: Optional[Tuple[datetime, ObjectId]] = None) -> List[Submission]:
+        return SubmissionRepository._page(Submission.objects(contest_id=ObjectId(contest_id)), skip, limit, after)
 
     @staticmethod
-    def find_by_contest(contest_id: str, skip: int = 0, limit: int = 100) -> List[Submission]:
-        return Submission.objects(contest_id=ObjectId(contest_id)).order_by('-submitted_at').skip(skip).limit(limit)
+    def summaries(queryset: QuerySet) -> List[SubmissionSummary]:
+        # Raw documents skip both the code field and per-row reference dereferencing.
+        raw = BaseRepository.project(queryset, only=SubmissionSummary.FIELDS).as_pymongo()
+        return [SubmissionSummary.from_mongo(document) for document in raw]
+
+    @staticmethod
+    def _page(queryset: QuerySet, skip: int, limit: int,
+              after: Optional[Tuple[datetime, ObjectId]]) -> QuerySet:
+        # Keyset pagination: resume strictly after the last (submitted_at, _id) seen, newest first.
+        if after is not None:
+            submitted_at, last_id = after
+            queryset = queryset.filter(Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, id__lt=last_id))
+            skip = 0
+
+        return queryset.order_by('-submitted_at', '-id').skip(skip).limit(limit)
 
     @staticmethod
     def create(submission_data: dict) -> Submission:
@@ -46,9 +69,10 @@ class SubmissionRepository(BaseRepository[Submission]):
             return None
 
     @staticmethod
-    def find_by_id(submission_id: str) -> Optional[Submission]:
+    def find_by_id(submission_id: str, only: Optional[Sequence[str]] = None,
+                   exclude: Optional[Sequence[str]] = None) -> Optional[Submission]:
         try:
-            return Submission.objects.get(id=ObjectId(submission_id))
+            return BaseRepository.project(Submission.objects, only, exclude).get(id=ObjectId(submission_id))
         except Submission.DoesNotExist:
             return None
 
@@ -72,9 +96,50 @@ class SubmissionRepository(BaseRepository[Submission]):
         except Submission.DoesNotExist:
             return None
 
-        submission.results = SubmissionResult.objects(submission_id=ObjectId(submission_id))
+        if submission.test_results:
+            submission.results = submission.test_results
+        else:
+            submission.results = SubmissionResult.objects(submission_id=ObjectId(submission_id))
         return submission
 
+    @staticmethod
+    def push_results(submission_id: str, results: List[Dict]) -> bool:
+        entries = [
+            TestResultEntry(
+                test_case_id=result['test_case_id'],
+                status=result['status'],
+                execution_time=result.get('execution_time'),
+                memory_used=result.get('memory_used'),
+                error=(result.get('error') or '')[:ERROR_PREVIEW_LENGTH] or None
+            )
+            for result in results
+        ]
+
+        return bool(Submission.objects(id=ObjectId(submission_id)).update_one(push_all__test_results=entries))
+
+    @staticmethod
+    def clear_results(submission_id: str) -> bool:
+        return bool(Submission.objects(id=ObjectId(submission_id)).update_one(set__test_results=[]))
+
+    @staticmethod
+    def set_status(submission_id: str, status: str) -> bool:
+        return bool(Submission.objects(id=ObjectId(submission_id)).update_one(set__status=status))
+
+    @staticmethod
+    def mark_standings_recorded(submission_id: str) -> bool:
+        return bool(Submission.objects(
+            id=ObjectId(submission_id), standings_recorded__ne=True
+        ).update_one(set__standings_recorded=True))
+
+    @staticmethod
+    def finalize(submission_id: str, status: str, score: int, max_time: float, max_memory: int) -> bool:
+        return bool(Submission.objects(id=ObjectId(submission_id)).update_one(
+            set__status=status,
+            set__score=score,
+            set__max_time=max_time,
+            set__max_memory=max_memory
+        ))
+
     @staticmethod
     def create_with_time(data: dict) -> Submission:
         if 'submitted_at' not in data:
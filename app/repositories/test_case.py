@@ -11,7 +11,7 @@ class TestCaseRepository(BaseRepository[TestCase]):
 
     @staticmethod
     def find_by_problem(problem_id: str) -> List[TestCase]:
-        return TestCase.objects(problem_id=ObjectId(problem_id))
+        return TestCase.objects(problem_id=ObjectId(problem_id)).order_by('id')
 
     @staticmethod
     def find_samples_by_problem(problem_id: str) -> List[TestCase]:
@@ -0,0 +1,26 @@
+from typing import List, Optional
+from bson import ObjectId
+from mongoengine import NotUniqueError
+
+from .base import BaseRepository
+from database.models.verdict_cache import VerdictCacheEntry
+
+
+class VerdictCacheRepository(BaseRepository[VerdictCacheEntry]):
+    def __init__(self):
+        super().__init__(VerdictCacheEntry)
+
+    @staticmethod
+    def find_by_key(key: str) -> Optional[VerdictCacheEntry]:
+        return VerdictCacheEntry.objects(key=key).first()
+
+    @staticmethod
+    def store(key: str, problem_id: str, results: List[dict]) -> None:
+        try:
+            VerdictCacheEntry(key=key, problem_id=ObjectId(problem_id), results=results).save()
+        except NotUniqueError:
+            pass
+
+    @staticmethod
+    def invalidate_problem(problem_id: str) -> int:
+        return VerdictCacheEntry.objects(problem_id=ObjectId(problem_id)).delete()
@@ -1,9 +1,57 @@
+import fakeredis
+
+from core.config import settings
+from core.utils.idempotency import IdempotencyStore
+from core.utils.job_queue import JobQueue
+from core.utils.rate_limit import RateLimiter
+from database.redis import RedisSingleton
+from services.admission import AdmissionController
 from services.judge import JudgeService
+from services.judge_scheduler import JudgeScheduler
+from services.scoreboard import LiveScoreboard, SnapshotCache
 from services.submission import SubmissionService
+from services.verdict_events import VerdictEvents
 from services.contest import ContestService
 from services.problem import ProblemService
 
-judge_service = JudgeService()
-submission_service = SubmissionService()
+judge_redis = fakeredis.FakeAsyncRedis() if settings.judge_queue.fake else RedisSingleton.get_instance(
+    str(settings.judge_queue.url or settings.caching.url)
+)
+
+judge_queue = JobQueue(
+    redis=judge_redis,
+    stream=settings.judge_queue.stream,
+    group=settings.judge_queue.group,
+    dead_letter_stream=settings.judge_queue.dead_letter_stream,
+    visibility_timeout=settings.judge_queue.visibility_timeout,
+    max_retries=settings.judge_queue.max_retries
+)
+judge_scheduler = JudgeScheduler(
+    redis=judge_redis,
+    queue=judge_queue,
+    prefix=settings.judge_scheduler.prefix,
+    track_quota=settings.judge_scheduler.track_quota,
+    event_quota=settings.judge_scheduler.event_quota,
+    lock_ttl_ms=settings.judge_scheduler.lock_ttl_ms
+)
+
+scoreboard = LiveScoreboard(judge_redis, prefix=settings.scoreboard.prefix)
+scoreboard_snapshots = SnapshotCache(scoreboard, max_age=settings.scoreboard.snapshot_max_age)
+
+verdict_events = VerdictEvents(judge_redis)
+
+rate_limiter = RateLimiter(judge_redis, prefix=settings.rate_limit.prefix)
+admission = AdmissionController(rate_limiter, judge_scheduler)
+idempotency = IdempotencyStore(
+    judge_redis,
+    prefix=settings.idempotency.prefix,
+    ttl=settings.idempotency.ttl,
+    lock_ttl=settings.idempotency.lock_ttl
+)
+
+judge_service = JudgeService(events=verdict_events)
+submission_service = SubmissionService(
+    judge_service, judge_scheduler, scoreboard, verdict_events, admission, idempotency
+)
 contest_service = ContestService()
 problem_service = ProblemService()
@@ -0,0 +1,74 @@
+import math
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from core.utils.rate_limit import RateLimiter
+from .judge_scheduler import JudgeScheduler
+
+
+class AdmissionController:
+    def __init__(self, limiter: RateLimiter, scheduler: Optional[JudgeScheduler] = None):
+        self.limiter = limiter
+        self.scheduler = scheduler
+
+    async def admit_submission(self, user_id: int, contest, priority: str) -> Dict[str, Any]:
+        if not settings.rate_limit.enabled:
+            return self._allowed()
+
+        contest_id = str(contest.id)
+        per_minute = contest.submissions_per_minute
+        if per_minute is None:
+            per_minute = settings.rate_limit.user_submissions_per_minute
+
+        decision = await self._take(f"submit:user:{contest_id}:{user_id}", per_minute)
+        if not decision["allowed"]:
+            return decision
+
+        decision = await self._take(
+            f"submit:contest:{contest_id}", settings.rate_limit.contest_submissions_per_minute
+        )
+        if not decision["allowed"]:
+            return decision
+
+        return await self._check_backpressure(priority)
+
+    async def admit_rejudge(self, contest_id: str) -> Dict[str, Any]:
+        if not settings.rate_limit.enabled:
+            return self._allowed()
+
+        decision = await self._take(f"rejudge:contest:{contest_id}", settings.rate_limit.rejudges_per_minute)
+        if not decision["allowed"]:
+            return decision
+
+        return await self._check_backpressure("rejudge")
+
+    async def _take(self, key: str, per_minute: int) -> Dict[str, Any]:
+        allowed, retry_after = await self.limiter.acquire(key, per_minute, per_minute / 60)
+
+        if allowed:
+            return self._allowed()
+
+        return {
+            "allowed": False,
+            "reason": "rate_limited",
+            "message": "Too many submissions, slow down",
+            "retry_after": max(1, math.ceil(retry_after))
+        }
+
+    async def _check_backpressure(self, priority: str) -> Dict[str, Any]:
+        if self.scheduler is None or priority not in settings.rate_limit.backpressure_shed:
+            return self._allowed()
+
+        if await self.scheduler.pending() < settings.rate_limit.backpressure_depth:
+            return self._allowed()
+
+        return {
+            "allowed": False,
+            "reason": "overloaded",
+            "message": f"Judge queue is saturated, {priority} work is temporarily not accepted",
+            "retry_after": settings.rate_limit.backpressure_retry_after
+        }
+
+    @staticmethod
+    def _allowed() -> Dict[str, Any]:
+        return {"allowed": True, "reason": None, "message": None, "retry_after": 0}
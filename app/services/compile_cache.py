@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import threading
+from hashlib import sha256
+from json import dumps
+from typing import Dict, List, Optional
+
+
+class CompileCache:
+    def __init__(self, root_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(language: str, command: Optional[List[str]], source: str) -> str:
+        key = dumps([language, command, source])
+        return sha256(key.encode()).hexdigest()
+
+    def restore(self, key: str, target_dir: str) -> bool:
+        entry = os.path.join(self.root_dir, key)
+
+        try:
+            for name in os.listdir(entry):
+                shutil.copy2(os.path.join(entry, name), os.path.join(target_dir, name))
+            os.utime(entry)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, source_dir: str, files: List[str]) -> None:
+        entry = os.path.join(self.root_dir, key)
+        if os.path.isdir(entry) or not files:
+            return
+
+        staging = tempfile.mkdtemp(dir=self.root_dir, prefix='.staging-')
+
+        try:
+            for name in files:
+                shutil.copy2(os.path.join(source_dir, name), os.path.join(staging, name))
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+
+            size = sum(
+                os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+            )
+            entries.append((os.path.getmtime(path), size, path))
+            total += size
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
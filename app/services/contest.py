@@ -11,7 +11,8 @@ class ContestService:
     @staticmethod
     def create_contest(name: str, description: str = None,
                        event_id: int = None, date_id: int = None,
-                       track_id: int = None) -> Dict[str, Any]:
+                       track_id: int = None, judging_policy: str = "full",
+                       submissions_per_minute: int = None) -> Dict[str, Any]:
         existing = contest_repo.find_by_name(name)
         if existing:
             return {"success": False, "message": "Contest with this name already exists"}
@@ -22,7 +23,9 @@ class ContestService:
             "event_id": event_id,
             "date_id": date_id,
             "track_id": track_id,
-            "is_active": True
+            "is_active": True,
+            "judging_policy": judging_policy,
+            "submissions_per_minute": submissions_per_minute
         }
 
         contest = contest_repo.create(contest_data)
@@ -87,6 +90,8 @@ class ContestService:
             "date_id": contest.date_id,
             "track_id": contest.track_id,
             "is_active": contest.is_active,
+            "judging_policy": contest.judging_policy,
+            "submissions_per_minute": contest.submissions_per_minute,
             "problems": [],
             "languages": []
         }
@@ -123,7 +128,9 @@ class ContestService:
                 "event_id": contest.event_id,
                 "date_id": contest.date_id,
                 "track_id": contest.track_id,
-                "is_active": contest.is_active
+                "is_active": contest.is_active,
+                "judging_policy": contest.judging_policy,
+                "submissions_per_minute": contest.submissions_per_minute
             })
 
         return result
@@ -196,7 +203,9 @@ class ContestService:
                 "event_id": contest.event_id,
                 "date_id": contest.date_id,
                 "track_id": contest.track_id,
-                "is_active": contest.is_active
+                "is_active": contest.is_active,
+                "judging_policy": contest.judging_policy,
+                "submissions_per_minute": contest.submissions_per_minute
             })
 
         return result
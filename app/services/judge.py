@@ -1,21 +1,105 @@
+import asyncio
+import functools
+import hashlib
+import json
+import logging
 import os
+import shutil
 import tempfile
 import subprocess
 import time
-from typing import Tuple
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from bson import ObjectId
 
+from core.config import settings
+from core.utils.write_buffer import WriteBehindBuffer
+from database.models.test_case import TestCase
 from repositories import (
+    contest_repo,
     submission_repo,
     submission_result_repo,
     test_case_repo,
-    problem_repo
+    problem_repo,
+    verdict_cache_repo
+)
+from .compile_cache import CompileCache
+from .sandbox import Sandbox, SandboxPool
+from .testset_cache import TESTSET_MOUNT, CachedTestset, TestsetCache
+from .verdict_events import VerdictEvents
+
+logger = logging.getLogger(__name__)
+
+CGROUP_HELPERS = """cpu_usage() {{
+    if [ ! -r /sys/fs/cgroup/cpu.stat ]; then
+        echo 0
+        return
+    fi
+    while read key value; do
+        if [ "$key" = usage_usec ]; then
+            echo "$value"
+            return
+        fi
+    done < /sys/fs/cgroup/cpu.stat
+    echo 0
+}}
+memory_peak() {{
+    cat /sys/fs/cgroup/memory.peak 2>/dev/null || echo 0
+}}
+"""
+
+RUN_SCRIPT = CGROUP_HELPERS + """cd /app
+ulimit -t {cpu_limit}
+echo 0 > /sys/fs/cgroup/memory.peak 2>/dev/null
+before=$(cpu_usage)
+timeout {wall_limit}s {command} < {input_name} > {output_name} 2> {error_name}
+code=$?
+after=$(cpu_usage)
+echo "$code $((after - before)) $(memory_peak)" > {usage_name}
+exit $code
+"""
+
+BATCH_DRIVER = CGROUP_HELPERS + """cd /app
+ulimit -t {cpu_limit}
+: > results.txt
+i=0
+while [ $i -lt {count} ]; do
+    echo 0 > /sys/fs/cgroup/memory.peak 2>/dev/null
+    read started _ < /proc/uptime
+    before=$(cpu_usage)
+    timeout {wall_limit}s {command} < {tests_dir}/$i.in > out/$i.out 2> out/$i.err
+    code=$?
+    after=$(cpu_usage)
+    read finished _ < /proc/uptime
+    echo "$i $code $started $finished $((after - before)) $(memory_peak)" >> results.txt
+    if [ $code -ne 0 ] && [ {stop_on_failure} -eq 1 ]; then
+        break
+    fi
+    i=$((i + 1))
+done
+"""
+
+MEMORY_LIMIT_STATUS = "Memory Limit Exceeded"
+
+VERDICT_PRECEDENCE = (
+    'Compilation Error',
+    'Runtime Error',
+    MEMORY_LIMIT_STATUS,
+    'Time Limit Exceeded',
+    'Wrong Answer'
 )
 
+TestResult = Tuple[str, float, int, str]
+
 
 class JudgeService:
-    def __init__(self, temp_dir=None):
+    def __init__(self, temp_dir=None, sandbox_pool: Optional[SandboxPool] = None,
+                 compile_cache: Optional[CompileCache] = None,
+                 testset_cache: Optional[TestsetCache] = None,
+                 events: Optional[VerdictEvents] = None):
         self.temp_dir = temp_dir or tempfile.gettempdir()
+        self.events = events
         self.docker_images = {
             'python': 'python:3.12-slim',
             'python3': 'python:3.12-slim',
@@ -49,75 +133,325 @@ class JudgeService:
             'go': ['go', 'build', '-o', '{executable}', '{file}']
         }
 
-    def judge_submission(self, submission_id: str) -> bool:
-        submission = submission_repo.find_by_id(submission_id)
-        if not submission:
-            return False
+        if testset_cache is None and settings.judge.testset_cache_enabled:
+            testset_cache = TestsetCache(
+                root_dir=settings.judge.testset_cache_dir or os.path.join(self.temp_dir, 'judge-testsets'),
+                max_bytes=settings.judge.testset_cache_max_bytes
+            )
+        self.testset_cache = testset_cache
+
+        if sandbox_pool is None and settings.judge.sandbox_pool_enabled:
+            sandbox_pool = SandboxPool(
+                root_dir=settings.judge.sandbox_work_dir or os.path.join(self.temp_dir, 'judge-sandboxes'),
+                size=settings.judge.sandbox_pool_size,
+                idle_timeout=settings.judge.sandbox_idle_timeout,
+                health_check_interval=settings.judge.sandbox_health_check_interval,
+                memory_limit=settings.judge.sandbox_memory_limit,
+                read_only_mounts=self._read_only_mounts()
+            )
+        self.sandbox_pool = sandbox_pool
 
-        problem = problem_repo.find_by_id(str(submission.problem_id.id))
-        if not problem:
-            return False
+        if compile_cache is None and settings.judge.compile_cache_enabled:
+            compile_cache = CompileCache(
+                root_dir=settings.judge.compile_cache_dir or os.path.join(self.temp_dir, 'judge-compile-cache'),
+                max_bytes=settings.judge.compile_cache_max_bytes
+            )
+        self.compile_cache = compile_cache
+
+        self.result_buffer = None
+        if settings.judge.result_write_behind:
+            self.result_buffer = WriteBehindBuffer(
+                submission_result_repo,
+                flush_interval=settings.judge.result_flush_interval,
+                max_batch=settings.judge.result_flush_max_batch
+            )
 
-        submission_result_repo.clear_for_submission(submission_id)
+        cpus = settings.judge.cpu_set or sorted(os.sched_getaffinity(0))
+        self.free_cpus: asyncio.Queue = asyncio.Queue()
+        for cpu in cpus[:max(1, min(settings.judge.parallel_workers, len(cpus)))]:
+            self.free_cpus.put_nowait(cpu)
 
-        test_cases = test_case_repo.find_by_problem(str(problem.id))
+    def warm_up(self) -> None:
+        if self.sandbox_pool:
+            self.sandbox_pool.warm_up(
+                list(self.docker_images.values()),
+                settings.judge.sandbox_prestart
+            )
 
-        if not test_cases:
+    def shutdown(self) -> None:
+        if self.result_buffer:
+            self.result_buffer.close()
+
+        if self.sandbox_pool:
+            self.sandbox_pool.shutdown()
+
+    async def judge_submission(self, submission_id: str) -> bool:
+        context = await asyncio.to_thread(self._load_context, submission_id)
+        if context is None:
             return False
 
-        with tempfile.TemporaryDirectory(dir=self.temp_dir) as temp_dir:
-            file_path, executable_path, class_name = self._prepare_files(
+        submission, problem, test_cases, stop_on_failure = context
+
+        verdict_key = self._verdict_cache_key(submission, problem, stop_on_failure)
+        cached_results = await asyncio.to_thread(self._cached_verdict, verdict_key)
+        if cached_results is not None:
+            await self._write_results(submission_id, cached_results)
+            await asyncio.to_thread(self._finalize_submission, submission_id, test_cases, cached_results)
+            return True
+
+        notify = functools.partial(self._publish_test, submission_id, test_cases)
+
+        pooled = settings.judge.execution_mode != "parallel"
+        async with self._workspace(submission.language, pooled) as (temp_dir, sandbox):
+            file_path, executable_path, class_name = await asyncio.to_thread(
+                self._prepare_files,
                 temp_dir,
                 submission.code,
                 submission.language
             )
 
-            compile_success, compile_error = self._compile_code(
+            compile_success, compile_error = await self._compile_code(
                 submission.language,
                 file_path,
                 executable_path
             )
 
             if not compile_success:
-                for test_case in test_cases:
-                    submission_result_repo.create({
-                        'submission_id': ObjectId(submission_id),
-                        'test_case_id': test_case.id,
-                        'status': 'Compilation Error',
-                        'execution_time': 0,
-                        'memory_used': 0,
-                        'error': compile_error
-                    })
+                results = self._compilation_error_results(test_cases, compile_error)
+                await self._write_results(submission_id, results)
+                await asyncio.to_thread(self._remember_verdict, verdict_key, problem, results)
+                await asyncio.to_thread(self._finalize_submission, submission_id, test_cases, results)
                 return True
 
-            for test_case in test_cases:
-                status, exec_time, memory, error = self._run_test(
+            if self.compile_cache:
+                logger.info("Compile cache stats: %s", self.compile_cache.stats())
+
+            if settings.judge.execution_mode == "parallel":
+                run_results = await self._run_tests_parallel(
                     submission.language,
                     file_path,
                     executable_path,
                     class_name,
-                    test_case.input_data,
-                    test_case.expected_output,
+                    test_cases,
                     problem.time_limit,
-                    problem.memory_limit
+                    problem.memory_limit,
+                    stop_on_failure,
+                    notify
+                )
+            elif settings.judge.execution_mode == "batch":
+                run_results = await self._run_tests_batch(
+                    submission.language,
+                    file_path,
+                    executable_path,
+                    class_name,
+                    test_cases,
+                    problem.time_limit,
+                    problem.memory_limit,
+                    sandbox,
+                    stop_on_failure
                 )
 
-                submission_result_repo.create({
-                    'submission_id': ObjectId(submission_id),
-                    'test_case_id': test_case.id,
-                    'status': status,
-                    'execution_time': exec_time,
-                    'memory_used': memory,
-                    'error': error
-                })
-
-        if submission_id:
-            self._update_submission_status(submission_id)
-        else:
-            raise ValueError("submission_id is required but not provided")
+                for index, run_result in enumerate(run_results):
+                    if run_result is not None:
+                        await notify(index, run_result)
+            else:
+                run_results = []
+                for test_case in test_cases:
+                    if stop_on_failure and run_results and run_results[-1][0] != 'Accepted':
+                        break
+
+                    run_results.append(await self._run_test(
+                        submission.language,
+                        file_path,
+                        executable_path,
+                        class_name,
+                        test_case,
+                        problem.time_limit,
+                        problem.memory_limit,
+                        sandbox
+                    ))
+                    await notify(len(run_results) - 1, run_results[-1])
+
+                run_results += [None] * (len(test_cases) - len(run_results))
+
+            results = self._test_results(test_cases, run_results)
+            await self._write_results(submission_id, results)
+            await asyncio.to_thread(self._remember_verdict, verdict_key, problem, results)
+
+        await asyncio.to_thread(self._finalize_submission, submission_id, test_cases, results)
 
         return True
 
+    def _load_context(self, submission_id: str):
+        submission = submission_repo.find_by_id(submission_id)
+        if not submission:
+            return None
+
+        problem = problem_repo.find_by_id(str(submission.problem_id.id))
+        if not problem:
+            return None
+
+        if not problem.testset_hash:
+            problem = problem_repo.bump_testset(str(problem.id)) or problem
+
+        if settings.judge.result_storage == "embedded":
+            submission_repo.clear_results(submission_id)
+        else:
+            submission_result_repo.clear_for_submission(submission_id)
+
+        test_cases = self._load_test_cases(problem)
+
+        if not test_cases:
+            return None
+
+        contest = contest_repo.find_by_id(str(submission.contest_id.id))
+        stop_on_failure = contest is not None and contest.judging_policy == 'first_failure'
+
+        return submission, problem, test_cases, stop_on_failure
+
+    def _load_test_cases(self, problem) -> List[TestCase]:
+        if self.testset_cache is None:
+            return list(test_case_repo.find_by_problem(str(problem.id)))
+
+        testset = self.testset_cache.lookup(problem.testset_hash)
+        if testset is not None:
+            return testset
+
+        test_cases = list(test_case_repo.find_by_problem(str(problem.id)))
+
+        # The tests may have been edited since the problem was read; never file them under a stale hash.
+        if not test_cases or problem_repo.hash_test_cases(test_cases) != problem.testset_hash:
+            return test_cases
+
+        return self.testset_cache.materialize(problem.testset_hash, test_cases) or test_cases
+
+    def _read_only_mounts(self) -> Dict[str, str]:
+        if self.testset_cache is None:
+            return {}
+
+        return {self.testset_cache.root_dir: TESTSET_MOUNT}
+
+    @staticmethod
+    def _compilation_error_results(test_cases: List[TestCase], compile_error: str) -> List[Dict]:
+        return [
+            {
+                'test_case_id': test_case.id,
+                'status': 'Compilation Error',
+                'execution_time': 0,
+                'memory_used': 0,
+                'error': compile_error
+            }
+            for test_case in test_cases
+        ]
+
+    @staticmethod
+    def _test_results(test_cases: List[TestCase], run_results: List[Optional[TestResult]]) -> List[Dict]:
+        results = []
+        for test_case, run_result in zip(test_cases, run_results):
+            status, exec_time, memory, error = run_result or ('Skipped', 0, 0, None)
+            results.append({
+                'test_case_id': test_case.id,
+                'status': status,
+                'execution_time': exec_time,
+                'memory_used': memory,
+                'error': error
+            })
+
+        return results
+
+    async def _write_results(self, submission_id: str, results: List[Dict]) -> None:
+        if settings.judge.result_storage == "embedded":
+            await asyncio.to_thread(submission_repo.push_results, submission_id, results)
+            return
+
+        documents = [{'submission_id': ObjectId(submission_id), **result} for result in results]
+
+        if self.result_buffer is not None:
+            await asyncio.wrap_future(self.result_buffer.add(documents))
+        else:
+            await asyncio.to_thread(submission_result_repo.create_many, documents)
+
+    async def _publish_test(self, submission_id: str, test_cases: List[TestCase], index: int,
+                            result: TestResult) -> None:
+        if self.events is None:
+            return
+
+        status, exec_time, memory, _ = result
+        await self.events.publish_test(submission_id, index, test_cases[index].id, status, exec_time, memory)
+
+    def _verdict_cache_key(self, submission, problem, stop_on_failure: bool) -> Optional[str]:
+        if not settings.judge.verdict_cache_enabled:
+            return None
+
+        lines = submission.code.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        code = '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+        payload = json.dumps([
+            hashlib.sha256(code.encode()).hexdigest(),
+            submission.language,
+            self.docker_images.get(submission.language),
+            str(problem.id),
+            problem.testset_version,
+            problem.testset_hash,
+            problem.time_limit,
+            problem.memory_limit,
+            stop_on_failure
+        ])
+
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _cached_verdict(cache_key: Optional[str]) -> Optional[List[Dict]]:
+        if cache_key is None:
+            return None
+
+        entry = verdict_cache_repo.find_by_key(cache_key)
+        if entry is None:
+            return None
+
+        logger.info("Replaying cached verdict %s", cache_key)
+        return [
+            {**result, 'test_case_id': ObjectId(result['test_case_id'])}
+            for result in entry.results
+        ]
+
+    @staticmethod
+    def _remember_verdict(cache_key: Optional[str], problem, results: List[Dict]) -> None:
+        if cache_key is None:
+            return
+
+        # Timeouts depend on host load, so they are always judged afresh.
+        if any(result['status'] == 'Time Limit Exceeded' for result in results):
+            return
+
+        verdict_cache_repo.store(cache_key, str(problem.id), [
+            {**result, 'test_case_id': str(result['test_case_id'])}
+            for result in results
+        ])
+
+    @asynccontextmanager
+    async def _workspace(self, language: str, pooled: bool = True) -> AsyncIterator[Tuple[str, Optional[Sandbox]]]:
+        sandbox = None
+        if self.sandbox_pool and pooled:
+            image = self.docker_images.get(language, 'python:3.12-slim')
+            sandbox = await asyncio.to_thread(self.sandbox_pool.lease, image)
+
+        if sandbox is None:
+            temp_dir = await asyncio.to_thread(tempfile.mkdtemp, dir=self.temp_dir)
+            try:
+                yield temp_dir, None
+            finally:
+                await asyncio.shield(asyncio.to_thread(shutil.rmtree, temp_dir, True))
+            return
+
+        try:
+            yield sandbox.work_dir, sandbox
+        except BaseException:
+            sandbox.healthy = False
+            raise
+        finally:
+            await asyncio.shield(asyncio.to_thread(self.sandbox_pool.release, sandbox))
+
     def _prepare_files(self, temp_dir: str, code: str, language: str) -> Tuple[str, str, str]:
         file_extension = self.file_extensions.get(language, '.txt')
         filename = f"solution{file_extension}"
@@ -142,12 +476,44 @@ class JudgeService:
 
         return file_path, executable_path, class_name
 
-    def _compile_code(self, language: str, file_path: str, executable_path: str) -> Tuple[bool, str]:
+    async def _compile_code(self, language: str, file_path: str, executable_path: str) -> Tuple[bool, str]:
         compile_command = self.compile_commands.get(language)
 
         if not compile_command:
             return True, ""
 
+        work_dir = os.path.dirname(file_path)
+        cache_key = await asyncio.to_thread(self._compile_cache_key, language, compile_command, file_path)
+
+        if cache_key and await asyncio.to_thread(self.compile_cache.restore, cache_key, work_dir):
+            return True, ""
+
+        existing_files = set(os.listdir(work_dir))
+        command = self._build_compile_command(compile_command, file_path, executable_path)
+
+        try:
+            returncode, _, stderr = await self._communicate(command, timeout=30)
+
+            if returncode != 0:
+                return False, stderr
+
+            await asyncio.to_thread(self._store_compiled, cache_key, work_dir, existing_files)
+
+            return True, ""
+        except asyncio.TimeoutError:
+            return False, "Compilation timed out"
+        except Exception as e:
+            return False, str(e)
+
+    def _compile_cache_key(self, language: str, compile_command: List[str], file_path: str) -> Optional[str]:
+        if not self.compile_cache:
+            return None
+
+        with open(file_path, 'r') as f:
+            return CompileCache.make_key(language, compile_command, f.read())
+
+    @staticmethod
+    def _build_compile_command(compile_command: List[str], file_path: str, executable_path: str) -> List[str]:
         command = []
         for part in compile_command:
             if '{file}' in part:
@@ -156,40 +522,324 @@ class JudgeService:
                 part = part.replace('{executable}', executable_path)
             command.append(part)
 
+        return command
+
+    def _store_compiled(self, cache_key: Optional[str], work_dir: str, existing_files: Set[str]) -> None:
+        if not cache_key:
+            return
+
+        artifacts = [
+            name for name in os.listdir(work_dir)
+            if name not in existing_files and os.path.isfile(os.path.join(work_dir, name))
+        ]
+        self.compile_cache.store(cache_key, work_dir, artifacts)
+
+    async def _run_test(
+            self,
+            language: str,
+            file_path: str,
+            executable_path: str,
+            class_name: str,
+            test_case: TestCase,
+            time_limit: float,
+            memory_limit: int,
+            sandbox: Optional[Sandbox] = None,
+            test_index: Optional[int] = None,
+            cpu: Optional[int] = None,
+            run_name: Optional[str] = None
+    ) -> TestResult:
+        work_dir = os.path.dirname(file_path)
+        shell_cmd, file_names = await asyncio.to_thread(
+            self._prepare_test,
+            language, file_path, executable_path, class_name, test_case, time_limit, test_index
+        )
+
+        start_time = time.time()
         try:
-            process = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=30
+            returncode = await self._execute(
+                language,
+                work_dir,
+                shell_cmd,
+                time_limit,
+                memory_limit,
+                self._wall_limit(time_limit) + 5,
+                sandbox,
+                cpu,
+                run_name
             )
 
-            if process.returncode != 0:
-                return False, process.stderr
+            return await asyncio.to_thread(
+                self._collect_test,
+                work_dir,
+                file_names,
+                returncode,
+                time.time() - start_time,
+                test_case,
+                time_limit,
+                memory_limit
+            )
 
-            return True, ""
-        except subprocess.TimeoutExpired:
-            return False, "Compilation timed out"
+        except asyncio.TimeoutError:
+            return "Time Limit Exceeded", time_limit, 0, "Execution timed out"
         except Exception as e:
-            return False, str(e)
+            return "Runtime Error", 0, 0, str(e)
 
-    def _run_test(
+    def _prepare_test(
             self,
             language: str,
             file_path: str,
             executable_path: str,
             class_name: str,
-            input_data: str,
-            expected_output: str,
+            test_case: TestCase,
+            time_limit: float,
+            test_index: Optional[int] = None
+    ) -> Tuple[List[str], Tuple[str, str, str]]:
+        work_dir = os.path.dirname(file_path)
+        suffix = f'_{test_index}' if test_index is not None else ''
+        input_name, output_name, error_name, usage_name = (
+            f'{name}{suffix}.txt' for name in ('input', 'output', 'error', 'usage')
+        )
+
+        if isinstance(test_case, TestCase):
+            with open(os.path.join(work_dir, input_name), 'w') as f:
+                f.write(test_case.input_data or "")
+        else:
+            input_name = test_case.input_path
+
+        cmd_parts = self._build_run_command(language, file_path, executable_path, class_name)
+        shell_cmd = [
+            'sh', '-c',
+            RUN_SCRIPT.format(
+                cpu_limit=int(time_limit + 1),
+                wall_limit=self._wall_limit(time_limit),
+                command=" ".join(cmd_parts),
+                input_name=input_name,
+                output_name=output_name,
+                error_name=error_name,
+                usage_name=usage_name
+            )
+        ]
+
+        return shell_cmd, (output_name, error_name, usage_name)
+
+    def _collect_test(
+            self,
+            work_dir: str,
+            file_names: Tuple[str, str, str],
+            returncode: int,
+            wall_time: float,
+            test_case: TestCase,
             time_limit: float,
             memory_limit: int
-    ) -> Tuple[str, float, int, str]:
-        input_file = os.path.join(os.path.dirname(file_path), 'input.txt')
-        with open(input_file, 'w') as f:
-            f.write(input_data or "")
+    ) -> TestResult:
+        output_name, error_name, usage_name = file_names
+
+        output = self._read_file(os.path.join(work_dir, output_name))
+        error = self._read_file(os.path.join(work_dir, error_name))
+        usage = self._read_file(os.path.join(work_dir, usage_name)).split()
+
+        if len(usage) == 3:
+            cpu_time, memory_used = self._parse_usage(usage[1], usage[2], wall_time)
+        else:
+            cpu_time, memory_used = wall_time, 0
+
+        return self._verdict(
+            returncode,
+            output,
+            test_case.expected_output,
+            error,
+            cpu_time,
+            memory_used,
+            time_limit,
+            memory_limit
+        )
+
+    async def _run_tests_batch(
+            self,
+            language: str,
+            file_path: str,
+            executable_path: str,
+            class_name: str,
+            test_cases: List[TestCase],
+            time_limit: float,
+            memory_limit: int,
+            sandbox: Optional[Sandbox] = None,
+            stop_on_failure: bool = False
+    ) -> List[Optional[TestResult]]:
+        work_dir = os.path.dirname(file_path)
+        await asyncio.to_thread(
+            self._prepare_batch,
+            language, file_path, executable_path, class_name, test_cases, time_limit, stop_on_failure
+        )
 
-        docker_image = self.docker_images.get(language, 'python:3.12-slim')
+        try:
+            await self._execute(
+                language,
+                work_dir,
+                ['sh', '/app/driver.sh'],
+                time_limit,
+                memory_limit,
+                self._wall_limit(time_limit) * len(test_cases) + 10,
+                sandbox
+            )
+        except asyncio.TimeoutError:
+            pass
+        except Exception as e:
+            return [("Runtime Error", 0, 0, str(e)) for _ in test_cases]
+
+        return await asyncio.to_thread(
+            self._collect_batch, work_dir, test_cases, time_limit, memory_limit, stop_on_failure
+        )
+
+    def _prepare_batch(
+            self,
+            language: str,
+            file_path: str,
+            executable_path: str,
+            class_name: str,
+            test_cases: List[TestCase],
+            time_limit: float,
+            stop_on_failure: bool
+    ) -> None:
+        work_dir = os.path.dirname(file_path)
+        os.makedirs(os.path.join(work_dir, 'out'), exist_ok=True)
+
+        if isinstance(test_cases, CachedTestset):
+            tests_dir = test_cases.mount_dir
+        else:
+            tests_dir = 'tests'
+            os.makedirs(os.path.join(work_dir, tests_dir), exist_ok=True)
+
+            for index, test_case in enumerate(test_cases):
+                with open(os.path.join(work_dir, tests_dir, f'{index}.in'), 'w') as f:
+                    f.write(test_case.input_data or "")
+
+        cmd_parts = self._build_run_command(language, file_path, executable_path, class_name)
+        with open(os.path.join(work_dir, 'driver.sh'), 'w') as f:
+            f.write(BATCH_DRIVER.format(
+                cpu_limit=int(time_limit + 1),
+                count=len(test_cases),
+                tests_dir=tests_dir,
+                wall_limit=self._wall_limit(time_limit),
+                command=" ".join(cmd_parts),
+                stop_on_failure=int(stop_on_failure)
+            ))
+
+    def _collect_batch(
+            self,
+            work_dir: str,
+            test_cases: List[TestCase],
+            time_limit: float,
+            memory_limit: int,
+            stop_on_failure: bool
+    ) -> List[Optional[TestResult]]:
+        out_dir = os.path.join(work_dir, 'out')
+        manifest = {}
+
+        for line in self._read_file(os.path.join(work_dir, 'results.txt')).splitlines():
+            parts = line.split()
+            if len(parts) == 6:
+                index, returncode, started, finished, cpu_usec, peak = parts
+                wall_time = max(0.0, float(finished) - float(started))
+                manifest[int(index)] = (int(returncode),) + self._parse_usage(cpu_usec, peak, wall_time)
+
+        results = []
+        for index, test_case in enumerate(test_cases):
+            if stop_on_failure and results and results[-1][0] != 'Accepted':
+                results += [None] * (len(test_cases) - index)
+                break
+
+            if index not in manifest:
+                results.append(("Time Limit Exceeded", time_limit, 0, "Execution timed out"))
+                continue
+
+            returncode, cpu_time, memory_used = manifest[index]
+            output = self._read_file(os.path.join(out_dir, f'{index}.out'))
+            error = self._read_file(os.path.join(out_dir, f'{index}.err'))
+
+            results.append(self._verdict(
+                returncode,
+                output,
+                test_case.expected_output,
+                error,
+                cpu_time,
+                memory_used,
+                time_limit,
+                memory_limit
+            ))
+
+        return results
+
+    async def _run_tests_parallel(
+            self,
+            language: str,
+            file_path: str,
+            executable_path: str,
+            class_name: str,
+            test_cases: List[TestCase],
+            time_limit: float,
+            memory_limit: int,
+            stop_on_failure: bool = False,
+            on_result: Optional[Callable[[int, TestResult], Awaitable[None]]] = None
+    ) -> List[Optional[TestResult]]:
+        run_prefix = f'judge-run-{uuid.uuid4().hex[:12]}'
+
+        async def run(index: int, test_case: TestCase) -> TestResult:
+            cpu = await self.free_cpus.get()
+
+            try:
+                result = await self._run_test(
+                    language,
+                    file_path,
+                    executable_path,
+                    class_name,
+                    test_case,
+                    time_limit,
+                    memory_limit,
+                    None,
+                    index,
+                    cpu,
+                    f'{run_prefix}-{index}'
+                )
+            finally:
+                self.free_cpus.put_nowait(cpu)
 
+            if on_result is not None:
+                await on_result(index, result)
+
+            if stop_on_failure and result[0] != 'Accepted':
+                for task in tasks:
+                    if task is not asyncio.current_task():
+                        task.cancel()
+
+            return result
+
+        tasks = [
+            asyncio.create_task(run(index, test_case))
+            for index, test_case in enumerate(test_cases)
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [None if isinstance(result, asyncio.CancelledError) else result for result in results]
+
+    @staticmethod
+    def _kill_runs(run_prefix: str) -> None:
+        try:
+            process = subprocess.run(
+                ['docker', 'ps', '-q', '--filter', f'name={run_prefix}'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            container_ids = process.stdout.split()
+
+            if container_ids:
+                subprocess.run(['docker', 'kill'] + container_ids, capture_output=True, timeout=10)
+        except (subprocess.SubprocessError, OSError):
+            pass
+
+    def _build_run_command(self, language: str, file_path: str, executable_path: str,
+                           class_name: str) -> List[str]:
         run_command = self.run_commands.get(language, ['python', '{file}'])
         cmd_parts = []
 
@@ -202,94 +852,160 @@ class JudgeService:
                 part = part.replace('{class}', class_name)
             cmd_parts.append(part)
 
+        return cmd_parts
+
+    async def _execute(
+            self,
+            language: str,
+            work_dir: str,
+            shell_cmd: List[str],
+            time_limit: float,
+            memory_limit: int,
+            timeout: float,
+            sandbox: Optional[Sandbox] = None,
+            cpu: Optional[int] = None,
+            name: Optional[str] = None
+    ) -> int:
+        if sandbox is None and name is None:
+            name = f'judge-run-{uuid.uuid4().hex[:12]}'
+
+        command = await asyncio.to_thread(
+            self._execution_command,
+            language, work_dir, shell_cmd, time_limit, memory_limit, sandbox, cpu, name
+        )
+
+        try:
+            returncode, _, _ = await self._communicate(command, timeout)
+            return returncode
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if sandbox is not None:
+                sandbox.healthy = False
+            else:
+                await asyncio.shield(asyncio.to_thread(self._kill_runs, name))
+            raise
+
+    def _execution_command(
+            self,
+            language: str,
+            work_dir: str,
+            shell_cmd: List[str],
+            time_limit: float,
+            memory_limit: int,
+            sandbox: Optional[Sandbox] = None,
+            cpu: Optional[int] = None,
+            name: Optional[str] = None
+    ) -> List[str]:
+        cpus = max(0.1, time_limit / 2)
+
+        if sandbox is not None:
+            return self.sandbox_pool.exec_prefix(sandbox, memory_limit, cpus) + shell_cmd
+
         docker_cmd = [
             'docker', 'run',
             '--rm',
             '--network', 'none',
-            f'--cpus={max(0.1, time_limit / 2)}',
+            f'--cpus={cpus}',
             f'--memory={memory_limit}m',
             '--memory-swap=-1',
-            '-v', f'{os.path.dirname(file_path)}:/app',
+            '-v', f'{work_dir}:/app',
             '-w', '/app',
-            '--ulimit', f'cpu={int(time_limit + 1)}',
-            docker_image,
-            'sh', '-c',
-            f'cd /app && cat input.txt | timeout {time_limit}s {" ".join(cmd_parts)} > output.txt 2> error.txt'
+            '--ulimit', f'cpu={int(time_limit + 1)}'
         ]
 
-        start_time = time.time()
+        for host_path, container_path in self._read_only_mounts().items():
+            docker_cmd += ['-v', f'{host_path}:{container_path}:ro']
+
+        if cpu is not None:
+            docker_cmd.append(f'--cpuset-cpus={cpu}')
+
+        if name is not None:
+            docker_cmd += ['--name', name]
+
+        return docker_cmd + [self.docker_images.get(language, 'python:3.12-slim')] + shell_cmd
+
+    @staticmethod
+    async def _communicate(command: List[str], timeout: float) -> Tuple[int, str, str]:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
         try:
-            process = subprocess.run(
-                docker_cmd,
-                capture_output=True,
-                text=True,
-                timeout=time_limit * 2
-            )
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            process.kill()
+            await asyncio.shield(process.wait())
+            raise
 
-            exec_time = time.time() - start_time
+        return process.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
 
-            output_file = os.path.join(os.path.dirname(file_path), 'output.txt')
-            error_file = os.path.join(os.path.dirname(file_path), 'error.txt')
+    @staticmethod
+    def _read_file(path: str) -> str:
+        if not os.path.exists(path):
+            return ""
 
-            if os.path.exists(output_file):
-                with open(output_file, 'r') as f:
-                    output = f.read()
-            else:
-                output = ""
+        with open(path, 'r') as f:
+            return f.read()
 
-            if os.path.exists(error_file):
-                with open(error_file, 'r') as f:
-                    error = f.read()
-            else:
-                error = ""
+    @staticmethod
+    def _wall_limit(time_limit: float) -> float:
+        return round(time_limit * settings.judge.wall_time_multiplier + 1, 2)
 
-            memory_used = 0
+    @staticmethod
+    def _parse_usage(cpu_usec: str, peak: str, wall_time: float) -> Tuple[float, int]:
+        cpu_time = int(cpu_usec) / 1_000_000 if int(cpu_usec) > 0 else wall_time
+        return cpu_time, int(peak) // 1024
 
-            try:
-                if process.stdout:
-                    pass
-            except (OSError, subprocess.SubprocessError):
-                memory_used = 0
-
-            if process.returncode != 0:
-                if process.returncode == 124 or process.returncode == 137:
-                    return "Time Limit Exceeded", exec_time, memory_used, error
-                else:
-                    return "Runtime Error", exec_time, memory_used, error
-
-            output = output.strip()
-            expected = (expected_output or "").strip()
-
-            if output == expected:
-                return "Accepted", exec_time, memory_used, ""
+    @staticmethod
+    def _verdict(returncode: int, output: str, expected_output: str, error: str,
+                 cpu_time: float, memory_used: int, time_limit: float,
+                 memory_limit: int) -> TestResult:
+        if memory_used >= memory_limit * 1024:
+            return MEMORY_LIMIT_STATUS, cpu_time, memory_used, error
+
+        if cpu_time > time_limit or returncode == 124:
+            return "Time Limit Exceeded", cpu_time, memory_used, error
+
+        if returncode != 0:
+            if returncode == 137:
+                return "Time Limit Exceeded", cpu_time, memory_used, error
             else:
-                return "Wrong Answer", exec_time, memory_used, ""
+                return "Runtime Error", cpu_time, memory_used, error
 
-        except subprocess.TimeoutExpired:
-            return "Time Limit Exceeded", time_limit, 0, "Execution timed out"
-        except Exception as e:
-            return "Runtime Error", 0, 0, str(e)
+        output = output.strip()
+        expected = (expected_output or "").strip()
 
-    @staticmethod
-    def _update_submission_status(submission_id: str) -> None:
-        results = submission_result_repo.find_by_submission(submission_id)
+        if output == expected:
+            return "Accepted", cpu_time, memory_used, ""
+        else:
+            return "Wrong Answer", cpu_time, memory_used, ""
 
+    @staticmethod
+    def _finalize_submission(submission_id: str, test_cases: List[TestCase], results: List[Dict]) -> None:
         if not results:
-            submission_repo.update(submission_id, {'status': 'Error'})
+            submission_repo.set_status(submission_id, 'Error')
             return
 
-        statuses = [result.status for result in results]
-        if all(status == 'Accepted' for status in statuses):
+        weights = {test_case.id: test_case.weight or 0 for test_case in test_cases}
+        statuses = set()
+        score = 0
+        max_time = 0.0
+        max_memory = 0
+
+        for result in results:
+            statuses.add(result['status'])
+            max_time = max(max_time, result['execution_time'] or 0.0)
+            max_memory = max(max_memory, result['memory_used'] or 0)
+
+            if result['status'] == 'Accepted':
+                score += weights.get(result['test_case_id'], 0)
+
+        if statuses == {'Accepted'}:
             overall_status = 'Accepted'
-        elif 'Compilation Error' in statuses:
-            overall_status = 'Compilation Error'
-        elif 'Runtime Error' in statuses:
-            overall_status = 'Runtime Error'
-        elif 'Time Limit Exceeded' in statuses:
-            overall_status = 'Time Limit Exceeded'
-        elif 'Wrong Answer' in statuses:
-            overall_status = 'Wrong Answer'
         else:
-            overall_status = 'Unknown'
+            overall_status = next(
+                (status for status in VERDICT_PRECEDENCE if status in statuses), 'Unknown'
+            )
 
-        submission_repo.update(submission_id, {'status': overall_status})
+        submission_repo.finalize(submission_id, overall_status, score, max_time, max_memory)
@@ -0,0 +1,171 @@
+import time
+import uuid
+from json import dumps, loads
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+
+from core.utils.job_queue import JobQueue
+
+PRIORITY_CLASSES = ("contest", "custom", "rejudge", "archive")
+
+
+class JudgeScheduler:
+    def __init__(self, redis: Redis, queue: JobQueue, prefix: str = "judge:sched",
+                 track_quota: int = 0, event_quota: int = 0, lock_ttl_ms: int = 5000):
+        self.redis = redis
+        self.queue = queue
+        self.prefix = prefix
+        self.track_quota = track_quota
+        self.event_quota = event_quota
+        self.lock_ttl_ms = lock_ttl_ms
+
+    async def submit(self, submission_id: str, priority: str, user_id: int,
+                     track_id: Optional[int] = None, event_id: Optional[int] = None) -> None:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        job = {
+            "submission_id": submission_id,
+            "priority": priority,
+            "user_id": user_id,
+            "track_id": track_id,
+            "event_id": event_id,
+            "enqueued_at": time.time()
+        }
+
+        length = await self.redis.rpush(self._jobs_key(priority, user_id), dumps(job))
+        if length == 1:
+            await self.redis.rpush(self._users_key(priority), user_id)
+
+        await self.redis.hincrby(self._stats_key(priority), "pending", 1)
+
+    async def dispatch(self, limit: int = 1) -> int:
+        token = uuid.uuid4().hex
+        lock_key = f"{self.prefix}:lock"
+
+        if not await self.redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms):
+            return 0
+
+        dispatched = 0
+        try:
+            while dispatched < limit:
+                job = await self._pick()
+                if job is None:
+                    break
+
+                await self.queue.enqueue({
+                    key: str(value) for key, value in job.items() if value is not None
+                })
+                dispatched += 1
+        finally:
+            if await self.redis.get(lock_key) in (token, token.encode()):
+                await self.redis.delete(lock_key)
+
+        return dispatched
+
+    async def complete(self, fields: Dict[str, str]) -> None:
+        if fields.get("track_id"):
+            await self.redis.decr(self._inflight_key("track", fields["track_id"]))
+
+        if fields.get("event_id"):
+            await self.redis.decr(self._inflight_key("event", fields["event_id"]))
+
+    async def pending(self) -> int:
+        total = await self.queue.depth()
+
+        for priority in PRIORITY_CLASSES:
+            value = await self.redis.hget(self._stats_key(priority), "pending")
+            total += int(value) if value else 0
+
+        return total
+
+    async def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+
+        for priority in PRIORITY_CLASSES:
+            raw = await self.redis.hgetall(self._stats_key(priority))
+            values = {
+                (k.decode() if isinstance(k, bytes) else k): float(v) for k, v in raw.items()
+            }
+            dispatched = values.get("dispatched", 0)
+
+            result[priority] = {
+                "pending": int(values.get("pending", 0)),
+                "dispatched": int(dispatched),
+                "avg_wait": values.get("wait_total", 0) / dispatched if dispatched else 0.0,
+                "max_wait": values.get("wait_max", 0.0)
+            }
+
+        return result
+
+    async def _pick(self) -> Optional[Dict[str, Any]]:
+        for priority in PRIORITY_CLASSES:
+            users_key = self._users_key(priority)
+
+            for _ in range(await self.redis.llen(users_key)):
+                user_id = await self.redis.lmove(users_key, users_key, "LEFT", "RIGHT")
+                if user_id is None:
+                    break
+
+                user_id = user_id.decode() if isinstance(user_id, bytes) else user_id
+                jobs_key = self._jobs_key(priority, user_id)
+
+                raw = await self.redis.lindex(jobs_key, 0)
+                if raw is None:
+                    await self.redis.lrem(users_key, 1, user_id)
+                    continue
+
+                job = loads(raw)
+                if not await self._within_quota(job):
+                    continue
+
+                await self.redis.lpop(jobs_key)
+                if await self.redis.llen(jobs_key) == 0:
+                    await self.redis.lrem(users_key, 1, user_id)
+
+                await self._reserve_quota(job)
+                await self._record_wait(priority, time.time() - job["enqueued_at"])
+
+                return job
+
+        return None
+
+    async def _within_quota(self, job: Dict[str, Any]) -> bool:
+        for scope, quota in (("track", self.track_quota), ("event", self.event_quota)):
+            if not quota or job.get(f"{scope}_id") is None:
+                continue
+
+            inflight = await self.redis.get(self._inflight_key(scope, job[f"{scope}_id"]))
+            if inflight is not None and int(inflight) >= quota:
+                return False
+
+        return True
+
+    async def _reserve_quota(self, job: Dict[str, Any]) -> None:
+        for scope in ("track", "event"):
+            if job.get(f"{scope}_id") is not None:
+                await self.redis.incr(self._inflight_key(scope, job[f"{scope}_id"]))
+
+    async def _record_wait(self, priority: str, wait: float) -> None:
+        stats_key = self._stats_key(priority)
+
+        await self.redis.hincrby(stats_key, "pending", -1)
+        await self.redis.hincrby(stats_key, "dispatched", 1)
+        await self.redis.hincrbyfloat(stats_key, "wait_total", wait)
+
+        wait_max = await self.redis.hget(stats_key, "wait_max")
+        if wait_max is None or float(wait_max) < wait:
+            await self.redis.hset(stats_key, "wait_max", wait)
+
+    def _users_key(self, priority: str) -> str:
+        return f"{self.prefix}:{priority}:users"
+
+    def _jobs_key(self, priority: str, user_id) -> str:
+        return f"{self.prefix}:{priority}:user:{user_id}"
+
+    def _stats_key(self, priority: str) -> str:
+        return f"{self.prefix}:{priority}:stats"
+
+    def _inflight_key(self, scope: str, scope_id) -> str:
+        return f"{self.prefix}:inflight:{scope}:{scope_id}"
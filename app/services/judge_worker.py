@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Optional
+
+from core.config import settings
+from core.utils.job_queue import Job, JobQueue
+from .judge_scheduler import JudgeScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class JudgeWorker:
+    def __init__(self, queue: JobQueue, scheduler: JudgeScheduler, submission_service, consumer: str):
+        self.queue = queue
+        self.scheduler = scheduler
+        self.submission_service = submission_service
+        self.consumer = consumer
+        self._stopping = asyncio.Event()
+
+    async def run(self, concurrency: Optional[int] = None) -> None:
+        await self.queue.ensure_group()
+
+        concurrency = concurrency or settings.judge_queue.worker_concurrency
+        await asyncio.gather(*(
+            self._consume(f"{self.consumer}-{slot}") for slot in range(concurrency)
+        ))
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _consume(self, consumer: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                if await self.queue.depth() < settings.judge_scheduler.dispatch_window:
+                    await self.scheduler.dispatch()
+
+                job = await self.queue.reserve(consumer, settings.judge_queue.block_ms)
+            except Exception:
+                logger.exception("Failed to schedule or reserve judge job")
+                await asyncio.sleep(1)
+                continue
+
+            if job is not None:
+                await self._process(job, consumer)
+
+    async def _process(self, job: Job, consumer: str) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job, consumer))
+
+        try:
+            result = await self.submission_service.judge_submission(job.fields["submission_id"])
+        except Exception as e:
+            logger.exception("Judge job %s failed", job.message_id)
+            if await self.queue.fail(job, str(e)):
+                logger.error("Judge job %s moved to dead letter stream", job.message_id)
+                await self.scheduler.complete(job.fields)
+        else:
+            logger.info("Judge job %s finished: %s", job.message_id, result.get("message"))
+            await self.queue.ack(job)
+            await self.scheduler.complete(job.fields)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: Job, consumer: str) -> None:
+        while True:
+            await asyncio.sleep(settings.judge_queue.heartbeat_interval)
+            await self.queue.extend(job, consumer)
@@ -6,7 +6,8 @@ from repositories import (
     contest_repo,
     test_case_repo,
     input_type_repo,
-    output_type_repo
+    output_type_repo,
+    verdict_cache_repo
 )
 
 
@@ -76,6 +77,9 @@ class ProblemService:
         if not updated_problem:
             return {"success": False, "message": "Error updating problem"}
 
+        if "time_limit" in data or "memory_limit" in data:
+            verdict_cache_repo.invalidate_problem(problem_id)
+
         return {
             "success": True,
             "message": "Problem updated successfully",
@@ -94,6 +98,8 @@ class ProblemService:
         if not result:
             return {"success": False, "message": "Error deleting problem"}
 
+        verdict_cache_repo.invalidate_problem(problem_id)
+
         return {
             "success": True,
             "message": "Problem deleted successfully"
@@ -115,7 +121,9 @@ class ProblemService:
             "description": problem.description,
             "contest_id": str(problem.contest_id.id),
             "time_limit": problem.time_limit,
-            "memory_limit": problem.memory_limit
+            "memory_limit": problem.memory_limit,
+            "testset_version": problem.testset_version,
+            "testset_hash": problem.testset_hash
         }
 
         if hasattr(problem, "input_type_id") and problem.input_type_id:
@@ -138,6 +146,20 @@ class ProblemService:
 
         return result
 
+    @staticmethod
+    def get_testset(problem_id: str) -> Optional[Dict[str, Any]]:
+        problem = problem_repo.find_by_id(problem_id)
+
+        if not problem:
+            return None
+
+        return {
+            "problem_id": problem_id,
+            "testset_version": problem.testset_version,
+            "testset_hash": problem.testset_hash,
+            "test_count": test_case_repo.count(problem_id=ObjectId(problem_id))
+        }
+
     @staticmethod
     def get_problems_by_contest(contest_id: str) -> List[Dict[str, Any]]:
         contest = contest_repo.find_by_id(contest_id)
@@ -155,7 +177,9 @@ class ProblemService:
                 "title": problem.title,
                 "description": problem.description,
                 "time_limit": problem.time_limit,
-                "memory_limit": problem.memory_limit
+                "memory_limit": problem.memory_limit,
+                "testset_version": problem.testset_version,
+                "testset_hash": problem.testset_hash
             })
 
         return result
@@ -177,6 +201,8 @@ class ProblemService:
         }
 
         test_case = test_case_repo.create(test_case_data)
+        problem_repo.bump_testset(problem_id)
+        verdict_cache_repo.invalidate_problem(problem_id)
 
         return {
             "success": True,
@@ -196,6 +222,9 @@ class ProblemService:
         if not updated_test_case:
             return {"success": False, "message": "Error updating test case"}
 
+        problem_repo.bump_testset(str(test_case.problem_id.id))
+        verdict_cache_repo.invalidate_problem(str(test_case.problem_id.id))
+
         return {
             "success": True,
             "message": "Test case updated successfully",
@@ -214,6 +243,9 @@ class ProblemService:
         if not result:
             return {"success": False, "message": "Error deleting test case"}
 
+        problem_repo.bump_testset(str(test_case.problem_id.id))
+        verdict_cache_repo.invalidate_problem(str(test_case.problem_id.id))
+
         return {
             "success": True,
             "message": "Test case deleted successfully"
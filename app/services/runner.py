@@ -0,0 +1,242 @@
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+RUNNER_MOUNT = '/opt/judge'
+
+# Runs one test as an unprivileged user and reports how it ended on stdout.
+# Usage: judge-runner UID CPU_SECONDS WALL_MS OUTPUT_LIMIT INPUT OUTPUT ERROR -- COMMAND [ARGS...]
+RUNNER_SOURCE = r"""
+#define _GNU_SOURCE
+#include <errno.h>
+#include <fcntl.h>
+#include <grp.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <time.h>
+#include <unistd.h>
+
+static volatile sig_atomic_t timed_out = 0;
+static volatile pid_t child = -1;
+
+static void on_alarm(int sig)
+{
+    (void) sig;
+    timed_out = 1;
+    if (child > 0) {
+        kill(-child, SIGKILL);
+        kill(child, SIGKILL);
+    }
+}
+
+static int drop_privileges(uid_t uid)
+{
+    if (setgroups(0, NULL) != 0 || setresgid(uid, uid, uid) != 0 || setresuid(uid, uid, uid) != 0)
+        return -1;
+
+    return getuid() == uid && geteuid() == uid ? 0 : -1;
+}
+
+static void limit(int resource, rlim_t soft, rlim_t hard)
+{
+    struct rlimit value = {soft, hard};
+    setrlimit(resource, &value);
+}
+
+static void kill_leftovers(uid_t uid)
+{
+    pid_t killer = fork();
+
+    if (killer == 0) {
+        if (drop_privileges(uid) == 0)
+            kill(-1, SIGKILL);
+        _exit(0);
+    }
+
+    if (killer > 0)
+        while (waitpid(killer, NULL, 0) < 0 && errno == EINTR);
+}
+
+static long long elapsed_usec(const struct timespec *start)
+{
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (now.tv_sec - start->tv_sec) * 1000000LL + (now.tv_nsec - start->tv_nsec) / 1000;
+}
+
+int main(int argc, char **argv)
+{
+    if (argc < 10 || strcmp(argv[8], "--") != 0) {
+        fprintf(stderr, "usage: %s UID CPU_SECONDS WALL_MS OUTPUT_LIMIT INPUT OUTPUT ERROR -- COMMAND...\n", argv[0]);
+        return 2;
+    }
+
+    uid_t uid = (uid_t) strtoul(argv[1], NULL, 10);
+    rlim_t cpu = (rlim_t) strtoul(argv[2], NULL, 10);
+    long wall_ms = strtol(argv[3], NULL, 10);
+    rlim_t output_limit = (rlim_t) strtoull(argv[4], NULL, 10);
+    char **command = argv + 9;
+
+    if (uid == 0) {
+        fprintf(stderr, "judge-runner: refusing to run tests as root\n");
+        return 2;
+    }
+
+    int in = open(argv[5], O_RDONLY | O_CLOEXEC);
+    int out = open(argv[6], O_WRONLY | O_CREAT | O_TRUNC | O_CLOEXEC, 0600);
+    int err = open(argv[7], O_WRONLY | O_CREAT | O_TRUNC | O_CLOEXEC, 0600);
+    int status_pipe[2];
+
+    if (in < 0 || out < 0 || err < 0 || pipe2(status_pipe, O_CLOEXEC) != 0) {
+        perror("judge-runner: setup");
+        return 2;
+    }
+
+    struct sigaction action;
+    memset(&action, 0, sizeof(action));
+    action.sa_handler = on_alarm;
+    sigaction(SIGALRM, &action, NULL);
+
+    child = fork();
+    if (child < 0) {
+        perror("judge-runner: fork");
+        return 2;
+    }
+
+    if (child == 0) {
+        setpgid(0, 0);
+
+        if (dup2(in, 0) < 0 || dup2(out, 1) < 0 || dup2(err, 2) < 0)
+            goto failed;
+
+        long max_fd = sysconf(_SC_OPEN_MAX);
+        for (long fd = 3; fd < (max_fd > 0 && max_fd < 65536 ? max_fd : 65536); fd++)
+            if (fd != status_pipe[1])
+                close((int) fd);
+
+        limit(RLIMIT_CPU, cpu, cpu + 1);
+        limit(RLIMIT_FSIZE, output_limit, output_limit);
+        limit(RLIMIT_CORE, 0, 0);
+
+        if (drop_privileges(uid) != 0)
+            goto failed;
+
+        execvp(command[0], command);
+
+    failed:;
+        int error = errno;
+        ssize_t written = write(status_pipe[1], &error, sizeof(error));
+        (void) written;
+        _exit(127);
+    }
+
+    close(in);
+    close(out);
+    close(err);
+    close(status_pipe[1]);
+
+    int child_error = 0;
+    ssize_t received;
+    while ((received = read(status_pipe[0], &child_error, sizeof(child_error))) < 0 && errno == EINTR);
+    close(status_pipe[0]);
+
+    int status;
+    if (received > 0) {
+        while (waitpid(child, &status, 0) < 0 && errno == EINTR);
+        fprintf(stderr, "judge-runner: cannot start %s: %s\n", command[0], strerror(child_error));
+        return 2;
+    }
+
+    struct timespec started;
+    clock_gettime(CLOCK_MONOTONIC, &started);
+
+    struct itimerval timer;
+    memset(&timer, 0, sizeof(timer));
+    timer.it_value.tv_sec = wall_ms / 1000;
+    timer.it_value.tv_usec = (wall_ms % 1000) * 1000;
+    setitimer(ITIMER_REAL, &timer, NULL);
+
+    struct rusage usage;
+    while (wait4(child, &status, 0, &usage) < 0) {
+        if (errno != EINTR) {
+            perror("judge-runner: wait4");
+            return 2;
+        }
+    }
+
+    long long wall_usec = elapsed_usec(&started);
+    memset(&timer, 0, sizeof(timer));
+    setitimer(ITIMER_REAL, &timer, NULL);
+
+    kill(-child, SIGKILL);
+    kill_leftovers(uid);
+
+    int code = WIFEXITED(status) ? WEXITSTATUS(status) : 128 + WTERMSIG(status);
+    printf("%d %d %lld\n", code, (int) timed_out, wall_usec);
+    return 0;
+}
+"""
+
+
+class SandboxRunner:
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.binary_name = f"judge-runner-{hashlib.sha256(RUNNER_SOURCE.encode()).hexdigest()[:12]}"
+        self._lock = threading.Lock()
+
+    @property
+    def host_path(self) -> str:
+        return os.path.join(self.root_dir, self.binary_name)
+
+    @property
+    def path(self) -> str:
+        return f'{RUNNER_MOUNT}/{self.binary_name}'
+
+    def ensure(self) -> bool:
+        if os.path.isfile(self.host_path):
+            return True
+
+        with self._lock:
+            if os.path.isfile(self.host_path):
+                return True
+
+            os.makedirs(self.root_dir, exist_ok=True)
+
+            with tempfile.TemporaryDirectory(dir=self.root_dir, prefix='.build-') as build_dir:
+                source = os.path.join(build_dir, 'runner.c')
+                target = os.path.join(build_dir, self.binary_name)
+
+                with open(source, 'w') as f:
+                    f.write(RUNNER_SOURCE)
+
+                # Static, so the same binary runs in every language image, glibc or musl.
+                try:
+                    process = subprocess.run(
+                        ['gcc', '-O2', '-static', '-o', target, source],
+                        capture_output=True,
+                        text=True,
+                        timeout=120
+                    )
+                except (subprocess.SubprocessError, OSError) as e:
+                    logger.error("Cannot build the sandbox runner: %s", e)
+                    return False
+
+                if process.returncode != 0:
+                    logger.error("Cannot build the sandbox runner: %s", process.stderr)
+                    return False
+
+                os.chmod(target, 0o755)
+                os.replace(target, self.host_path)
+
+        return True
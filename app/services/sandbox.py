@@ -0,0 +1,218 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+
+class Sandbox:
+    def __init__(self, container_id: str, image: str, work_dir: str):
+        self.container_id = container_id
+        self.image = image
+        self.work_dir = work_dir
+        self.limits: Optional[Tuple[int, float]] = None
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self.healthy = True
+
+    def __repr__(self):
+        return f"<Sandbox(container_id={self.container_id[:12]}, image='{self.image}')>"
+
+
+class SandboxPool:
+    def __init__(self, root_dir: str, size: int = 4, idle_timeout: int = 300,
+                 health_check_interval: int = 30, memory_limit: int = 512,
+                 read_only_mounts: Optional[Dict[str, str]] = None):
+        self.root_dir = root_dir
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.memory_limit = memory_limit
+        self.read_only_mounts = read_only_mounts or {}
+
+        self._idle: Dict[str, List[Sandbox]] = {}
+        self._leased: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self, images: List[str], count: int = 1) -> None:
+        for image in set(images):
+            for _ in range(min(count, self.size)):
+                sandbox = self._start(image)
+                if sandbox is None:
+                    break
+
+                with self._lock:
+                    self._idle.setdefault(image, []).append(sandbox)
+
+    def lease(self, image: str) -> Optional[Sandbox]:
+        self.evict_idle()
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(image, [])
+                sandbox = idle.pop() if idle else None
+
+                if sandbox is None:
+                    total = self._leased.get(image, 0) + len(idle)
+                    if total >= self.size:
+                        return None
+
+                self._leased[image] = self._leased.get(image, 0) + 1
+
+            if sandbox is None:
+                sandbox = self._start(image)
+                if sandbox is None:
+                    self._release_slot(image)
+                    return None
+
+                return sandbox
+
+            if self._check_health(sandbox):
+                return sandbox
+
+            self._release_slot(image)
+            self._destroy(sandbox)
+
+    def release(self, sandbox: Sandbox) -> None:
+        self._release_slot(sandbox.image)
+
+        if not sandbox.healthy or not self._reset(sandbox):
+            self._destroy(sandbox)
+            return
+
+        sandbox.last_used = time.monotonic()
+
+        with self._lock:
+            self._idle.setdefault(sandbox.image, []).append(sandbox)
+
+    def exec_prefix(self, sandbox: Sandbox, memory_limit: int, cpus: float) -> List[str]:
+        if sandbox.limits != (memory_limit, cpus):
+            self._update_limits(sandbox, memory_limit, cpus)
+
+        return ['docker', 'exec', '-w', '/app', sandbox.container_id]
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        expired = []
+
+        with self._lock:
+            for image, idle in self._idle.items():
+                keep = [s for s in idle if now - s.last_used < self.idle_timeout]
+                expired.extend(s for s in idle if s not in keep)
+                self._idle[image] = keep
+
+        for sandbox in expired:
+            self._destroy(sandbox)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            sandboxes = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+
+        for sandbox in sandboxes:
+            self._destroy(sandbox)
+
+    def _release_slot(self, image: str) -> None:
+        with self._lock:
+            self._leased[image] = max(0, self._leased.get(image, 0) - 1)
+
+    def _start(self, image: str) -> Optional[Sandbox]:
+        name = f"judge-sandbox-{uuid.uuid4().hex[:12]}"
+        work_dir = os.path.join(self.root_dir, name)
+        os.makedirs(work_dir, exist_ok=True)
+
+        mounts = []
+        for host_path, container_path in self.read_only_mounts.items():
+            mounts += ['-v', f'{host_path}:{container_path}:ro']
+
+        try:
+            process = subprocess.run(
+                [
+                    'docker', 'run', '-d', '--rm',
+                    '--name', name,
+                    '--network', 'none',
+                    f'--memory={self.memory_limit}m',
+                    '--memory-swap=-1',
+                    '-v', f'{work_dir}:/app',
+                    *mounts,
+                    '-w', '/app',
+                    image,
+                    'sleep', 'infinity'
+                ],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+        except (subprocess.SubprocessError, OSError):
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return None
+
+        if process.returncode != 0:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return None
+
+        return Sandbox(process.stdout.strip(), image, work_dir)
+
+    def _check_health(self, sandbox: Sandbox) -> bool:
+        if time.monotonic() - sandbox.last_checked < self.health_check_interval:
+            return True
+
+        try:
+            process = subprocess.run(
+                ['docker', 'inspect', '-f', '{{.State.Running}}', sandbox.container_id],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+        except (subprocess.SubprocessError, OSError):
+            return False
+
+        sandbox.last_checked = time.monotonic()
+        return process.returncode == 0 and process.stdout.strip() == 'true'
+
+    @staticmethod
+    def _update_limits(sandbox: Sandbox, memory_limit: int, cpus: float) -> None:
+        subprocess.run(
+            [
+                'docker', 'update',
+                f'--memory={memory_limit}m',
+                '--memory-swap=-1',
+                f'--cpus={cpus}',
+                sandbox.container_id
+            ],
+            capture_output=True,
+            timeout=10
+        )
+        sandbox.limits = (memory_limit, cpus)
+
+    @staticmethod
+    def _reset(sandbox: Sandbox) -> bool:
+        try:
+            process = subprocess.run(
+                [
+                    'docker', 'exec', sandbox.container_id,
+                    'sh', '-c', 'kill -9 -1 2>/dev/null; rm -rf /app/* /app/.[!.]* /tmp/* 2>/dev/null; true'
+                ],
+                capture_output=True,
+                timeout=10
+            )
+        except (subprocess.SubprocessError, OSError):
+            return False
+
+        return process.returncode == 0
+
+    @staticmethod
+    def _destroy(sandbox: Sandbox) -> None:
+        try:
+            subprocess.run(
+                ['docker', 'rm', '-f', sandbox.container_id],
+                capture_output=True,
+                timeout=30
+            )
+        except (subprocess.SubprocessError, OSError):
+            pass
+
+        shutil.rmtree(sandbox.work_dir, ignore_errors=True)
+
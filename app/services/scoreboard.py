@@ -0,0 +1,303 @@
+import asyncio
+import gzip
+import logging
+import time
+import uuid
+from json import dumps, loads
+from typing import Any, Dict, List, Optional
+
+from redis.asyncio import Redis
+
+from repositories import contest_result_repo
+
+logger = logging.getLogger(__name__)
+
+SCORE_SCALE = 10 ** 9
+
+
+class LiveScoreboard:
+    def __init__(self, redis: Redis, prefix: str = "scoreboard"):
+        self.redis = redis
+        self.prefix = prefix
+
+    @staticmethod
+    def composite_score(total_score: int, penalty: int) -> float:
+        return total_score * SCORE_SCALE - penalty
+
+    async def update(self, contest_id: str, user_id: int, total_score: int,
+                     solved_score: int, penalty: int) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._ranking_key(contest_id), {str(user_id): self.composite_score(total_score, penalty)})
+            pipe.hset(self._details_key(contest_id), str(user_id), dumps({
+                "total_score": total_score,
+                "solved_score": solved_score,
+                "penalty": penalty
+            }))
+            await pipe.execute()
+
+    async def mark_dirty(self, contest_id: str, user_id: int) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(self._dirty_users_key(contest_id), str(user_id))
+            pipe.sadd(self._dirty_contests_key(), contest_id)
+            await pipe.execute()
+
+    async def recompute_dirty(self, interval_ms: int) -> int:
+        contest_ids = await self.redis.smembers(self._dirty_contests_key())
+        recomputed = 0
+
+        for contest_id in contest_ids:
+            contest_id = contest_id.decode() if isinstance(contest_id, bytes) else contest_id
+
+            # At most one recomputation per contest per interval, across all workers.
+            throttle_key = f"{self.prefix}:{contest_id}:throttle"
+            if not await self.redis.set(throttle_key, uuid.uuid4().hex, nx=True, px=interval_ms):
+                continue
+
+            if await self._recompute(contest_id):
+                recomputed += 1
+
+        return recomputed
+
+    async def version(self, contest_id: str) -> int:
+        value = await self.redis.get(self._version_key(contest_id))
+        return int(value) if value else 0
+
+    async def page(self, contest_id: str, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+
+        members = await self.redis.zrevrange(self._ranking_key(contest_id), offset, offset + limit - 1)
+        return await self._entries(contest_id, members, offset)
+
+    async def size(self, contest_id: str) -> int:
+        return await self.redis.zcard(self._ranking_key(contest_id))
+
+    async def rank(self, contest_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        position = await self.redis.zrevrank(self._ranking_key(contest_id), str(user_id))
+        if position is None:
+            return None
+
+        entries = await self._entries(contest_id, [str(user_id)], position)
+        return entries[0]
+
+    async def around(self, contest_id: str, user_id: int, radius: int = 5) -> List[Dict[str, Any]]:
+        position = await self.redis.zrevrank(self._ranking_key(contest_id), str(user_id))
+        if position is None:
+            return []
+
+        offset = max(0, position - radius)
+        return await self.page(contest_id, offset, position - offset + radius + 1)
+
+    async def rebuild(self, contest_id: str) -> int:
+        results = list(contest_result_repo.find_by_contest(contest_id))
+        ranking_key = self._ranking_key(contest_id)
+        details_key = self._details_key(contest_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(ranking_key, details_key)
+
+            if results:
+                pipe.zadd(ranking_key, {
+                    str(r.user_id): self.composite_score(r.total_score, r.penalty) for r in results
+                })
+                pipe.hset(details_key, mapping={
+                    str(r.user_id): dumps({
+                        "total_score": r.total_score,
+                        "solved_score": r.solved_score,
+                        "penalty": r.penalty
+                    })
+                    for r in results
+                })
+
+            await pipe.execute()
+
+        await self._publish(contest_id)
+        return len(results)
+
+    async def _recompute(self, contest_id: str) -> bool:
+        dirty_key = self._dirty_users_key(contest_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.smembers(dirty_key)
+            pipe.delete(dirty_key)
+            pipe.srem(self._dirty_contests_key(), contest_id)
+            members, _, _ = await pipe.execute()
+
+        if not members:
+            return False
+
+        user_ids = [int(m.decode() if isinstance(m, bytes) else m) for m in members]
+        results = await asyncio.to_thread(
+            lambda: list(contest_result_repo.find_by_users(contest_id, user_ids))
+        )
+
+        if results:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(self._ranking_key(contest_id), {
+                    str(r.user_id): self.composite_score(r.total_score, r.penalty) for r in results
+                })
+                pipe.hset(self._details_key(contest_id), mapping={
+                    str(r.user_id): dumps({
+                        "total_score": r.total_score,
+                        "solved_score": r.solved_score,
+                        "penalty": r.penalty
+                    })
+                    for r in results
+                })
+                await pipe.execute()
+
+        await self._publish(contest_id)
+        return True
+
+    async def freeze(self, contest_id: str) -> None:
+        await self.redis.set(self._frozen_key(contest_id), 1)
+
+    async def unfreeze(self, contest_id: str) -> int:
+        await self.redis.delete(self._frozen_key(contest_id))
+        return await self._publish(contest_id)
+
+    async def is_frozen(self, contest_id: str) -> bool:
+        return bool(await self.redis.exists(self._frozen_key(contest_id)))
+
+    async def snapshot(self, contest_id: str, version: Optional[int] = None) -> Optional["ScoreboardSnapshot"]:
+        raw = await self.redis.hgetall(self._snapshot_key(contest_id))
+        raw = {(k.decode() if isinstance(k, bytes) else k): v for k, v in raw.items()}
+
+        if not raw or (version is not None and int(raw["version"]) != version):
+            return None
+
+        return ScoreboardSnapshot(contest_id, int(raw["version"]), raw["json"], raw["gzip"])
+
+    async def snapshot_version(self, contest_id: str) -> Optional[int]:
+        value = await self.redis.hget(self._snapshot_key(contest_id), "version")
+        return int(value) if value is not None else None
+
+    async def _publish(self, contest_id: str) -> int:
+        version = await self.redis.incr(self._version_key(contest_id))
+
+        if not await self.is_frozen(contest_id):
+            await self._materialize_snapshot(contest_id, version)
+
+        await self.redis.publish(self._updates_channel(contest_id), version)
+        return version
+
+    async def _materialize_snapshot(self, contest_id: str, version: int) -> None:
+        members = await self.redis.zrevrange(self._ranking_key(contest_id), 0, -1)
+        body = dumps(await self._entries(contest_id, members, 0), separators=(",", ":")).encode()
+
+        await self.redis.hset(self._snapshot_key(contest_id), mapping={
+            "version": version,
+            "json": body,
+            "gzip": gzip.compress(body)
+        })
+
+    async def _entries(self, contest_id: str, members: List, offset: int) -> List[Dict[str, Any]]:
+        if not members:
+            return []
+
+        details = await self.redis.hmget(self._details_key(contest_id), members)
+
+        entries = []
+        for position, (member, raw) in enumerate(zip(members, details)):
+            member = member.decode() if isinstance(member, bytes) else member
+            values = loads(raw) if raw else {"total_score": 0, "solved_score": 0, "penalty": 0}
+
+            entries.append({
+                "user_id": int(member),
+                **values,
+                "rank": offset + position + 1
+            })
+
+        return entries
+
+    def _ranking_key(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:ranking"
+
+    def _details_key(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:details"
+
+    def _version_key(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:version"
+
+    def _updates_channel(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:updates"
+
+    def _snapshot_key(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:snapshot"
+
+    def _frozen_key(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:frozen"
+
+    def _dirty_users_key(self, contest_id: str) -> str:
+        return f"{self.prefix}:{contest_id}:dirty"
+
+    def _dirty_contests_key(self) -> str:
+        return f"{self.prefix}:dirty"
+
+
+class ScoreboardSnapshot:
+    def __init__(self, contest_id: str, version: int, body: bytes, compressed: bytes):
+        self.contest_id = contest_id
+        self.version = version
+        self.body = body
+        self.compressed = compressed
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.contest_id}-{self.version}"'
+
+    def __repr__(self):
+        return f"<ScoreboardSnapshot(contest_id={self.contest_id}, version={self.version})>"
+
+
+class SnapshotCache:
+    def __init__(self, scoreboard: LiveScoreboard, max_age: float = 1.0):
+        self.scoreboard = scoreboard
+        self.max_age = max_age
+        self._snapshots: Dict[str, ScoreboardSnapshot] = {}
+        self._checked_at: Dict[str, float] = {}
+
+    async def get(self, contest_id: str) -> Optional[ScoreboardSnapshot]:
+        cached = self._snapshots.get(contest_id)
+        now = time.monotonic()
+
+        if cached is not None and now - self._checked_at.get(contest_id, 0) < self.max_age:
+            return cached
+
+        version = await self.scoreboard.snapshot_version(contest_id)
+        self._checked_at[contest_id] = now
+
+        if version is None:
+            self._snapshots.pop(contest_id, None)
+            return None
+
+        if cached is not None and cached.version == version:
+            return cached
+
+        snapshot = await self.scoreboard.snapshot(contest_id, version)
+        if snapshot is not None:
+            self._snapshots[contest_id] = snapshot
+
+        return snapshot or cached
+
+
+class ScoreboardRecomputer:
+    def __init__(self, scoreboard: LiveScoreboard, interval: float = 1.0):
+        self.scoreboard = scoreboard
+        self.interval = interval
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.scoreboard.recompute_dirty(int(self.interval * 1000))
+            except Exception:
+                logger.exception("Failed to recompute dirty scoreboards")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        self._stopping.set()
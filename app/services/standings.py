@@ -0,0 +1,78 @@
+from typing import Any, Dict
+
+from repositories import (
+    contest_result_repo,
+    problem_standing_repo,
+    submission_repo
+)
+from .judge import MEMORY_LIMIT_STATUS
+
+PENALTY_PER_ATTEMPT = 10
+
+REJECTED_STATUSES = (
+    'Wrong Answer',
+    'Runtime Error',
+    'Time Limit Exceeded',
+    MEMORY_LIMIT_STATUS
+)
+
+
+class StandingsService:
+    @staticmethod
+    def record_verdict(submission) -> Dict[str, Any]:
+        if submission.status != 'Accepted' and submission.status not in REJECTED_STATUSES:
+            return {"success": False, "message": "Verdict does not affect standings"}
+
+        submission_id = str(submission.id)
+        if not submission_repo.mark_standings_recorded(submission_id):
+            return {"success": False, "message": "Verdict already recorded"}
+
+        contest_id = str(submission.contest_id.id)
+        problem_id = str(submission.problem_id.id)
+
+        if submission.status != 'Accepted':
+            problem_standing_repo.record_rejection(contest_id, submission.user_id, problem_id)
+            contest_result = contest_result_repo.increment(contest_id, submission.user_id)
+
+            return {
+                "success": True,
+                "message": "Rejected attempt recorded",
+                "solved": False,
+                "contest_result": StandingsService._totals(contest_result)
+            }
+
+        standing = problem_standing_repo.record_acceptance(
+            contest_id,
+            submission.user_id,
+            problem_id,
+            submission.submitted_at,
+            PENALTY_PER_ATTEMPT
+        )
+
+        if standing is None:
+            return {"success": True, "message": "Problem already solved", "solved": True}
+
+        contest_result = contest_result_repo.increment(
+            contest_id,
+            submission.user_id,
+            total_score=1,
+            solved_score=1,
+            penalty=standing.penalty
+        )
+
+        return {
+            "success": True,
+            "message": "Accepted attempt recorded",
+            "solved": True,
+            "contest_result": StandingsService._totals(contest_result)
+        }
+
+    @staticmethod
+    def _totals(contest_result) -> Dict[str, Any]:
+        return {
+            "contest_id": str(contest_result.contest_id.id),
+            "user_id": contest_result.user_id,
+            "total_score": contest_result.total_score,
+            "solved_score": contest_result.solved_score,
+            "penalty": contest_result.penalty
+        }
@@ -1,23 +1,92 @@
+import asyncio
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from bson import ObjectId
 
+from core.utils.cursor import decode_cursor, encode_cursor
+from core.utils.idempotency import (
+    IDEMPOTENCY_IN_PROGRESS,
+    IDEMPOTENCY_MISMATCH,
+    IDEMPOTENCY_REPLAY,
+    IdempotencyStore
+)
 from repositories import (
-    submission,
-    problem,
-    contest_repo,
-    contest_result_repo
+    submission_repo,
+    problem_repo,
+    contest_repo
 )
+from .admission import AdmissionController
 from .judge import JudgeService
+from .judge_scheduler import JudgeScheduler
+from .scoreboard import LiveScoreboard
+from .verdict_events import VerdictEvents
+from .standings import StandingsService
 
 
 class SubmissionService:
-    def __init__(self):
-        self.judge_service = JudgeService()
+    def __init__(self, judge_service: Optional[JudgeService] = None,
+                 judge_scheduler: Optional[JudgeScheduler] = None,
+                 scoreboard: Optional[LiveScoreboard] = None,
+                 events: Optional[VerdictEvents] = None,
+                 admission: Optional[AdmissionController] = None,
+                 idempotency: Optional[IdempotencyStore] = None):
+        self.judge_service = judge_service or JudgeService()
+        self.judge_scheduler = judge_scheduler
+        self.scoreboard = scoreboard
+        self.events = events
+        self.admission = admission
+        self.idempotency = idempotency
+
+    async def create_submission(self, user_id: int, problem_id: str, contest_id: str,
+                                language: str, code: str,
+                                idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        if not idempotency_key or self.idempotency is None:
+            return await self._create_submission(user_id, problem_id, contest_id, language, code)
+
+        scope = f"submission:{user_id}"
+        fingerprint = IdempotencyStore.fingerprint({
+            "problem_id": problem_id,
+            "contest_id": contest_id,
+            "language": language,
+            "code": code
+        })
+
+        outcome, response = await self.idempotency.begin(scope, idempotency_key, fingerprint)
+
+        if outcome == IDEMPOTENCY_REPLAY:
+            return {**response, "replayed": True}
+
+        if outcome == IDEMPOTENCY_IN_PROGRESS:
+            return {
+                "success": False,
+                "reason": "in_progress",
+                "message": "A request with this Idempotency-Key is still being processed"
+            }
+
+        if outcome == IDEMPOTENCY_MISMATCH:
+            return {
+                "success": False,
+                "reason": "idempotency_mismatch",
+                "message": "Idempotency-Key was already used with a different submission"
+            }
 
-    def create_submission(self, user_id: int, problem_id: str, contest_id: str,
-                          language: str, code: str) -> Dict[str, Any]:
-        prob = problem.find_by_id(problem_id)
+        try:
+            result = await self._create_submission(user_id, problem_id, contest_id, language, code)
+        except Exception:
+            await self.idempotency.release(scope, idempotency_key)
+            raise
+
+        # Only accepted submissions are remembered, so a rejected request can be retried with the same key.
+        if result["success"]:
+            await self.idempotency.complete(scope, idempotency_key, fingerprint, result)
+        else:
+            await self.idempotency.release(scope, idempotency_key)
+
+        return result
+
+    async def _create_submission(self, user_id: int, problem_id: str, contest_id: str,
+                                 language: str, code: str) -> Dict[str, Any]:
+        prob = problem_repo.find_by_id(problem_id)
         if not prob:
             return {"success": False, "message": "problem not found"}
 
@@ -25,42 +94,105 @@ class SubmissionService:
         if not contest:
             return {"success": False, "message": "Contest not found"}
 
+        priority = self._priority(contest)
+
+        if self.admission is not None:
+            decision = await self.admission.admit_submission(user_id, contest, priority)
+            if not decision["allowed"]:
+                return {
+                    "success": False,
+                    "message": decision["message"],
+                    "reason": decision["reason"],
+                    "retry_after": decision["retry_after"]
+                }
+
         submission_data = {
             "user_id": user_id,
             "problem_id": ObjectId(problem_id),
             "contest_id": ObjectId(contest_id),
             "language": language,
             "code": code,
-            "submitted_at": datetime.datetime.now(datetime.UTC),
+            "submitted_at": datetime.now(timezone.utc),
             "status": "Pending"
         }
 
-        sub = submission.create(submission_data)
+        sub = submission_repo.create(submission_data)
 
-        self.judge_submission(str(sub.id))
+        if not await self._enqueue(str(sub.id), user_id, contest, priority):
+            submission_repo.set_status(str(sub.id), "Error")
+            return {"success": False, "message": "judge queue is not available"}
 
         return {
             "success": True,
             "message": "submission created successfully",
-            "submission_id": str(sub.id)
+            "submission_id": str(sub.id),
+            "status": "Pending"
         }
 
-    def judge_submission(self, submission_id: str) -> Dict[str, Any]:
-        sub = submission.find_by_id(submission_id)
+    async def enqueue_judging(self, submission_id: str, priority: Optional[str] = None) -> bool:
+        sub = submission_repo.find_by_id(submission_id)
+        if not sub:
+            return False
+
+        contest = contest_repo.find_by_id(str(sub.contest_id.id))
+
+        return await self._enqueue(submission_id, sub.user_id, contest, priority)
+
+    async def _enqueue(self, submission_id: str, user_id: int, contest, priority: Optional[str] = None) -> bool:
+        # User code only ever runs on judge workers, never in the request that submitted it.
+        if self.judge_scheduler is None:
+            return False
+
+        if priority is None:
+            priority = self._priority(contest)
+
+        await self.judge_scheduler.submit(
+            submission_id,
+            priority,
+            user_id,
+            track_id=contest.track_id if contest else None,
+            event_id=contest.event_id if contest else None
+        )
+        return True
+
+    @staticmethod
+    def _priority(contest) -> str:
+        return "contest" if contest and contest.is_active else "archive"
+
+    async def judge_submission(self, submission_id: str) -> Dict[str, Any]:
+        # Worker-side Mongo calls run off the event loop so job heartbeats keep flowing.
+        sub = await asyncio.to_thread(submission_repo.find_by_id, submission_id)
         if not sub:
             return {"success": False, "message": "submission not found"}
 
-        submission.update(submission_id, {"status": "Judging"})
+        await asyncio.to_thread(submission_repo.set_status, submission_id, "Judging")
+        await self._publish_status(submission_id, "Judging")
 
-        result = self.judge_service.judge_submission(submission_id)
+        result = await self.judge_service.judge_submission(submission_id)
 
         if not result:
-            submission.update(submission_id, {"status": "Error"})
+            await asyncio.to_thread(submission_repo.set_status, submission_id, "Error")
+            await self._publish_status(submission_id, "Error", final=True)
             return {"success": False, "message": "Error while judging submission"}
 
-        updated_submission = submission.find_with_results(submission_id)
+        updated_submission = await asyncio.to_thread(submission_repo.find_by_id, submission_id)
 
-        self._update_contest_results(str(updated_submission.contest_id), updated_submission.user_id)
+        await self._publish_status(
+            submission_id,
+            updated_submission.status,
+            final=True,
+            score=updated_submission.score,
+            max_time=updated_submission.max_time,
+            max_memory=updated_submission.max_memory
+        )
+
+        standing = await asyncio.to_thread(StandingsService.record_verdict, updated_submission)
+
+        if self.scoreboard and standing.get("contest_result"):
+            await self.scoreboard.mark_dirty(
+                standing["contest_result"]["contest_id"],
+                standing["contest_result"]["user_id"]
+            )
 
         return {
             "success": True,
@@ -68,9 +200,40 @@ class SubmissionService:
             "status": updated_submission.status
         }
 
+    async def rejudge_submission(self, submission_id: str) -> Dict[str, Any]:
+        sub = submission_repo.find_by_id(submission_id)
+        if not sub:
+            return {"success": False, "message": "Submission not found"}
+
+        if self.admission is not None:
+            decision = await self.admission.admit_rejudge(str(sub.contest_id.id))
+            if not decision["allowed"]:
+                return {
+                    "success": False,
+                    "message": decision["message"],
+                    "reason": decision["reason"],
+                    "retry_after": decision["retry_after"]
+                }
+
+        await self.mark_rejudging(submission_id)
+
+        if not await self.enqueue_judging(submission_id, priority="rejudge"):
+            submission_repo.set_status(submission_id, "Error")
+            return {"success": False, "message": "judge queue is not available"}
+
+        return {"success": True, "message": "Submission queued for rejudge"}
+
+    async def mark_rejudging(self, submission_id: str) -> None:
+        submission_repo.set_status(submission_id, "Rejudging")
+        await self._publish_status(submission_id, "Rejudging")
+
+    async def _publish_status(self, submission_id: str, status: str, **extra: Any) -> None:
+        if self.events is not None:
+            await self.events.publish_status(submission_id, status, **extra)
+
     @staticmethod
     def get_submission(submission_id: str) -> Optional[Dict[str, Any]]:
-        sub = submission.find_with_results(submission_id)
+        sub = submission_repo.find_with_results(submission_id)
         if not sub:
             return None
 
@@ -83,14 +246,17 @@ class SubmissionService:
             "code": sub.code,
             "submitted_at": sub.submitted_at.isoformat(),
             "status": getattr(sub, "status", "Unknown"),
+            "score": sub.score,
+            "max_time": sub.max_time,
+            "max_memory": sub.max_memory,
             "results": []
         }
 
         if hasattr(sub, "results"):
             for test_result in sub.results:
                 result["results"].append({
-                    "id": str(test_result.id),
-                    "test_case_id": str(test_result.test_case_id.id),
+                    "id": str(test_result.id) if getattr(test_result, "id", None) else None,
+                    "test_case_id": str(getattr(test_result.test_case_id, "id", test_result.test_case_id)),
                     "status": test_result.status,
                     "execution_time": test_result.execution_time,
                     "memory_used": test_result.memory_used,
@@ -100,67 +266,55 @@ class SubmissionService:
         return result
 
     @staticmethod
-    def get_user_submissions(user_id: int, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
-        submissions = submission.find_by_user(user_id, skip, limit)
+    def get_user_submissions(user_id: int, skip: int = 0, limit: int = 20,
+                             cursor: Optional[str] = None) -> Dict[str, Any]:
+        return SubmissionService._list_submissions(
+            lambda after, fetch: submission_repo.find_by_user(user_id, skip, fetch, after), limit, cursor
+        )
+
+    @staticmethod
+    def get_contest_submissions(contest_id: str, skip: int = 0, limit: int = 20,
+                                cursor: Optional[str] = None) -> Dict[str, Any]:
+        return SubmissionService._list_submissions(
+            lambda after, fetch: submission_repo.find_by_contest(contest_id, skip, fetch, after), limit, cursor
+        )
+
+    @staticmethod
+    def get_problem_submissions(problem_id: str, skip: int = 0, limit: int = 20,
+                                cursor: Optional[str] = None) -> Dict[str, Any]:
+        return SubmissionService._list_submissions(
+            lambda after, fetch: submission_repo.find_by_problem(problem_id, skip, fetch, after), limit, cursor
+        )
 
-        result = []
+    @staticmethod
+    def _list_submissions(find, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return {"success": False, "message": "Invalid cursor"}
+
+        # One extra row tells whether another page exists without a count query.
+        submissions = submission_repo.summaries(find(after, limit + 1))
+        has_more = len(submissions) > limit
+        submissions = submissions[:limit]
+
+        next_cursor = None
+        if has_more and submissions:
+            next_cursor = encode_cursor(submissions[-1].submitted_at, submissions[-1].id)
+
+        items = []
         for sub in submissions:
-            result.append({
+            items.append({
                 "id": str(sub.id),
-                "problem_id": str(sub.problem_id.id),
-                "contest_id": str(sub.contest_id.id),
+                "user_id": sub.user_id,
+                "problem_id": str(sub.problem_id),
+                "contest_id": str(sub.contest_id),
                 "language": sub.language,
-                "submitted_at": sub.submitted_at.isoformat(),
-                "status": getattr(sub, "status", "Unknown")
+                "submitted_at": sub.submitted_at,
+                "status": sub.status,
+                "score": sub.score,
+                "max_time": sub.max_time,
+                "max_memory": sub.max_memory
             })
 
-        return result
-
-    @staticmethod
-    def _update_contest_results(contest_id: str, user_id: int) -> None:
-        problems = problem.find_by_contest(contest_id)
-        if not problems:
-            return
-
-        total_score = 0
-        solved_count = 0
-        penalty = 0
-
-        for prob in problems:
-            problem_id = str(prob.id)
-
-            user_submissions = submission.find(
-                user_id=user_id,
-                problem_id=ObjectId(problem_id),
-                contest_id=ObjectId(contest_id)
-            )
-
-            accepted_submission = None
-            for sub in user_submissions:
-                if getattr(sub, "status", "") == "Accepted":
-                    if not accepted_submission or sub.submitted_at < accepted_submission.submitted_at:
-                        accepted_submission = sub
-
-            if accepted_submission:
-                solved_count += 1
-
-                problem_weight = getattr(prob, "weight", 1)
-                total_score += problem_weight
-
-                # submission_time = accepted_submission.submitted_at
-
-                attempt_penalty = user_submissions.count() - 1
-
-                if attempt_penalty > 0:
-                    penalty += attempt_penalty * 10
-
-        contest_result_repo.update_or_create(
-            contest_id,
-            user_id,
-            {
-                "total_score": total_score,
-                "solved_score": solved_count,
-                "penalty": penalty
-            }
-        )
-        
\ No newline at end of file
+        return {"success": True, "items": items, "next_cursor": next_cursor}
@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import threading
+from json import dump, load
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+TESTSET_MOUNT = '/testsets'
+
+
+class CachedTestCase:
+    def __init__(self, test_case_id: ObjectId, weight: int, host_dir: str, mount_dir: str, index: int):
+        self.id = test_case_id
+        self.weight = weight
+        self.host_input_path = os.path.join(host_dir, f'{index}.in')
+        self.host_expected_path = os.path.join(host_dir, f'{index}.out')
+        self.input_path = f'{mount_dir}/{index}.in'
+
+    @property
+    def input_data(self) -> str:
+        with open(self.host_input_path) as f:
+            return f.read()
+
+    @property
+    def expected_output(self) -> str:
+        with open(self.host_expected_path) as f:
+            return f.read()
+
+    def __repr__(self):
+        return f"<CachedTestCase(id={self.id}, input_path='{self.input_path}')>"
+
+
+class CachedTestset(list):
+    def __init__(self, testset_hash: str, mount_dir: str, test_cases: List[CachedTestCase]):
+        super().__init__(test_cases)
+        self.testset_hash = testset_hash
+        self.mount_dir = mount_dir
+
+
+class TestsetCache:
+    def __init__(self, root_dir: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def lookup(self, testset_hash: str) -> Optional[CachedTestset]:
+        entry = os.path.join(self.root_dir, testset_hash)
+
+        try:
+            with open(os.path.join(entry, 'index.json')) as f:
+                index = load(f)
+            os.utime(entry)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return self._testset(testset_hash, index)
+
+    def materialize(self, testset_hash: str, test_cases: List) -> Optional[CachedTestset]:
+        entry = os.path.join(self.root_dir, testset_hash)
+        staging = tempfile.mkdtemp(dir=self.root_dir, prefix='.staging-')
+        index = []
+
+        try:
+            for position, test_case in enumerate(test_cases):
+                with open(os.path.join(staging, f'{position}.in'), 'w') as f:
+                    f.write(test_case.input_data or "")
+                with open(os.path.join(staging, f'{position}.out'), 'w') as f:
+                    f.write(test_case.expected_output or "")
+                index.append({'id': str(test_case.id), 'weight': test_case.weight})
+
+            with open(os.path.join(staging, 'index.json'), 'w') as f:
+                dump(index, f)
+
+            os.chmod(staging, 0o755)
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isfile(os.path.join(entry, 'index.json')):
+                return None
+
+        self._evict(keep=testset_hash)
+        return self._testset(testset_hash, index)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _testset(self, testset_hash: str, index: List[Dict]) -> CachedTestset:
+        host_dir = os.path.join(self.root_dir, testset_hash)
+        mount_dir = f'{TESTSET_MOUNT}/{testset_hash}'
+
+        return CachedTestset(testset_hash, mount_dir, [
+            CachedTestCase(ObjectId(item['id']), item['weight'], host_dir, mount_dir, position)
+            for position, item in enumerate(index)
+        ])
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        total = 0
+
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+
+            size = sum(
+                os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+            )
+            total += size
+            if name != keep:
+                entries.append((os.path.getmtime(path), size, path))
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,53 @@
+from contextlib import asynccontextmanager
+from json import dumps, loads
+from typing import Any, AsyncIterator, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+IN_PROGRESS_STATUSES = ("Pending", "Judging", "Rejudging")
+
+
+class VerdictEvents:
+    def __init__(self, redis: Redis, prefix: str = "submission"):
+        self.redis = redis
+        self.prefix = prefix
+
+    async def publish_status(self, submission_id: str, status: str, **extra: Any) -> None:
+        await self._publish(submission_id, {"event": "status", "status": status, **extra})
+
+    async def publish_test(self, submission_id: str, index: int, test_case_id, status: str,
+                           execution_time: float, memory_used: int) -> None:
+        await self._publish(submission_id, {
+            "event": "test",
+            "index": index,
+            "test_case_id": str(test_case_id),
+            "status": status,
+            "execution_time": execution_time,
+            "memory_used": memory_used
+        })
+
+    @asynccontextmanager
+    async def subscribe(self, submission_id: str) -> AsyncIterator[PubSub]:
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self._channel(submission_id))
+
+        try:
+            yield pubsub
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+
+    @staticmethod
+    async def next_event(pubsub: PubSub, timeout: float) -> Optional[Dict[str, Any]]:
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None or message.get("type") != "message":
+            return None
+
+        return loads(message["data"])
+
+    async def _publish(self, submission_id: str, event: Dict[str, Any]) -> None:
+        await self.redis.publish(self._channel(submission_id), dumps(event))
+
+    def _channel(self, submission_id: str) -> str:
+        return f"{self.prefix}:{submission_id}:events"
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import signal
+import socket
+
+from core.config import settings
+from database.session import sessionmanager
+from services import judge_queue, judge_scheduler, judge_service, scoreboard, submission_service
+from services.judge_worker import JudgeWorker
+from services.scoreboard import ScoreboardRecomputer
+
+
+async def run_worker():
+    sessionmanager.init(
+        str(settings.db.url),
+        settings.db.db_name
+    )
+
+    worker = JudgeWorker(
+        judge_queue,
+        judge_scheduler,
+        submission_service,
+        consumer=f"{socket.gethostname()}-{os.getpid()}"
+    )
+    recomputer = ScoreboardRecomputer(scoreboard, settings.scoreboard.recompute_interval)
+
+    def stop():
+        worker.stop()
+        recomputer.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+
+    await asyncio.to_thread(judge_service.warm_up)
+    try:
+        await asyncio.gather(worker.run(), recomputer.run())
+    finally:
+        await asyncio.to_thread(judge_service.shutdown)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())